@@ -0,0 +1,361 @@
+"""
+NAME
+    cache
+
+DESCRIPTION
+    Keeps the parsed contents of database.txt and logfile.txt in memory
+    so the functions in the database module do not have to open and
+    re-parse a file every time they are called.
+    Each cached file is revalidated against its modification time and size
+    before it is used, so changes made by another program are still picked up.
+    When this program writes to a file, the cache is updated in place
+    instead of being thrown away.
+    The byte position of the last field on every line is also recorded, so
+    that field can be overwritten in place without rewriting the file.
+    Files are read under a shared lock and fields are overwritten under an
+    exclusive lock (see the locking module), so another copy of the
+    program never sees a half-written change.
+
+MODULE CONTENTS
+    read_records(file_name)
+    return_cached_records(file_name)
+    read_field(file_name, position)
+    replace_records(file_name, records)
+    append_records(file_name, records, texts)
+    write_fields(file_name, changes)
+    invalidate(file_name)
+    return_generation(file_name)
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+import os
+import locale
+import DatabaseFunctions.locking as locking
+
+#Files are read in binary so byte positions are known, then decoded using
+#the same encoding that open() would use in text mode.
+encoding = locale.getpreferredencoding(False)
+#Maps a file name to a dictionary holding its parsed records, the
+#(modification time, size) stamp they were read at, a generation number
+#and the (byte offset, width) of the last field on each line.
+cached_files = {}
+#Incremented every time a file has to be parsed again from scratch.
+generation_counter = 0
+
+def file_stamp(file_name):
+    """
+    Returns the modification time and size of a file, which are used
+    to tell whether the cached copy of the file is still up to date.
+
+    Parameters:
+    file_name (string): The file to stat.
+
+    Returns:
+    (tuple): The modification time (in nanoseconds) and size of the file.
+    """
+    stat = os.stat(file_name)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def parse_file(file_name):
+    """
+    Reads a comma separated file into a list of records, noting where
+    the last field of each line starts and how wide it is.
+
+    Parameters:
+    file_name (string): The file to read.
+
+    Returns:
+    records (list): List of every line in the file, split into its fields.
+    fields (list): The (byte offset, width) of the last field of each line.
+    """
+    records = []
+    fields = []
+    offset = 0
+    data_file = open(file_name,"rb")
+    for line in data_file:
+        content = line.rstrip(b"\r\n")
+        start = content.rfind(b", ")+2
+        if start == 1:
+            #The line only has one field
+            start = 0
+        fields.append((offset+start,len(content)-start))
+        record = line.decode(encoding).strip().split(", ")
+        records.append(record)
+        offset += len(line)
+    data_file.close()
+    return records,fields
+
+def read_records(file_name):
+    """
+    Returns the parsed records of a file, only reading the file again
+    if it has changed since it was last read.
+    The returned list is shared with the cache so it must not be modified.
+
+    Parameters:
+    file_name (string): The file to return the records of.
+
+    Returns:
+    records (list): List of all records in the file. This will be empty
+    if the file could not be read.
+    """
+    global generation_counter
+    try:
+        stamp = file_stamp(file_name)
+        cached = cached_files.get(file_name)
+        if cached != None and cached["stamp"] == stamp:
+            return cached["records"]
+        locking.acquire_lock(file_name,False)
+        try:
+            #Stat the file again now nothing can be changing it
+            stamp = file_stamp(file_name)
+            records,fields = parse_file(file_name)
+        finally:
+            locking.release_lock(file_name)
+    except:
+        invalidate(file_name)
+        return []
+    generation_counter += 1
+    cached_files[file_name] = {"stamp":stamp,"records":records,\
+                               "generation":generation_counter,\
+                               "fields":fields}
+    return records
+
+def return_cached_records(file_name):
+    """
+    Returns the cached records of a file without checking whether the
+    file has changed since it was read.
+
+    Parameters:
+    file_name (string): The file to return the records of.
+
+    Returns:
+    records (list): The cached records, or None if the file is not cached.
+    """
+    cached = cached_files.get(file_name)
+    if cached == None:
+        return None
+    return cached["records"]
+
+def read_field(file_name, position):
+    """
+    Returns the last field of one line of a file. If the file is cached
+    and has not changed size, the field is read straight from its position
+    in the file, so changes made in place by another program are seen
+    without parsing the whole file again.
+
+    Parameters:
+    file_name (string): The file to read from.
+    position (int): The index of the line to read.
+
+    Returns:
+    value (string): The value of the field, with any padding removed.
+    """
+    cached = cached_files.get(file_name)
+    try:
+        size = file_stamp(file_name)[1]
+    except OSError:
+        size = None
+    if cached != None and size == cached["stamp"][1]:
+        offset,width = cached["fields"][position]
+        locking.acquire_lock(file_name,False)
+        try:
+            data_file = open(file_name,"rb")
+            try:
+                data_file.seek(offset)
+                value = data_file.read(width).decode(encoding).strip()
+            finally:
+                data_file.close()
+        finally:
+            locking.release_lock(file_name)
+        cached["records"][position][-1] = value
+        return value
+    return read_records(file_name)[position][-1]
+
+def replace_records(file_name, records):
+    """
+    Updates the cache after this program has rewritten a whole file,
+    with the records joined by ", " and the lines joined by a new line.
+    If the file is not the size those records should produce, something
+    else has changed it as well, so the cache is dropped.
+
+    Parameters:
+    file_name (string): The file that was rewritten.
+    records (list): The records that were written to the file. Any padding
+    in the last field is removed once its width has been recorded.
+
+    Returns:
+    void
+    """
+    cached = cached_files.get(file_name)
+    if cached == None:
+        #Nothing has been read yet, so the next read will parse the file.
+        return
+    try:
+        stamp = file_stamp(file_name)
+    except OSError:
+        invalidate(file_name)
+        return
+    fields = []
+    offset = 0
+    for record in records:
+        line = ", ".join(record).encode(encoding)
+        width = len(record[-1].encode(encoding))
+        fields.append((offset+len(line)-width,width))
+        #Padding is not part of the value, so remove it from the cache
+        record[-1] = record[-1].strip()
+        #Add 1 for the new line character between records
+        offset += len(line)+1
+    if len(records) > 0:
+        offset -= 1
+    if offset != stamp[1]:
+        invalidate(file_name)
+        return
+    cached["stamp"] = stamp
+    cached["records"] = records
+    cached["fields"] = fields
+
+def append_records(file_name, records, texts):
+    """
+    Updates the cache after this program has appended records to a file
+    in a single write.
+    If the file has not grown by exactly the amount that was written,
+    something else has changed it as well, so the cache is dropped.
+
+    Parameters:
+    file_name (string): The file that was appended to.
+    records (list): The records that were appended.
+    texts (list): The text written for each record, each starting with
+    a new line.
+
+    Returns:
+    void
+    """
+    cached = cached_files.get(file_name)
+    if cached == None:
+        return
+    try:
+        stamp = file_stamp(file_name)
+    except OSError:
+        invalidate(file_name)
+        return
+    old_size = cached["stamp"][1]
+    lengths = [len(text.encode(encoding)) for text in texts]
+    if stamp[1] != old_size + sum(lengths):
+        invalidate(file_name)
+        return
+    offset = old_size
+    for i in range(len(records)):
+        start = texts[i].rfind(", ")+2
+        field_offset = offset + len(texts[i][:start].encode(encoding))
+        offset += lengths[i]
+        cached["records"].append(records[i])
+        cached["fields"].append((field_offset,offset-field_offset))
+    cached["stamp"] = stamp
+
+def write_fields(file_name, changes):
+    """
+    Overwrites the last field of several lines of a file in place, opening
+    the file only once. Nothing is written unless every value fits and the
+    file has not changed since it was cached, as the fields would no longer
+    be where the cache says they are.
+
+    Parameters:
+    file_name (string): The file to write to.
+    changes (list): The (line index, new value) of each field to change.
+
+    Returns:
+    (bool): False if the file is not cached, has changed since it was
+    cached or a value does not fit in its field, in which case nothing
+    is written.
+    """
+    locking.acquire_lock(file_name,True)
+    try:
+        #Checked once the lock is held, so nothing can change the file
+        #between checking it and writing to it
+        cached = cached_files.get(file_name)
+        if cached == None or file_stamp(file_name) != cached["stamp"]:
+            return False
+        writes = []
+        for position,value in changes:
+            offset,width = cached["fields"][position]
+            data = value.encode(encoding)
+            if len(data) > width:
+                return False
+            writes.append((offset,data.ljust(width)))
+        data_file = open(file_name,"r+b")
+        try:
+            for offset,data in writes:
+                data_file.seek(offset)
+                data_file.write(data)
+        finally:
+            data_file.close()
+        for position,value in changes:
+            cached["records"][position][-1] = value
+        cached["stamp"] = file_stamp(file_name)
+    finally:
+        locking.release_lock(file_name)
+    return True
+
+def invalidate(file_name):
+    """
+    Removes a file from the cache so it will be read again next time.
+
+    Parameters:
+    file_name (string): The file to remove from the cache.
+
+    Returns:
+    void
+    """
+    cached_files.pop(file_name, None)
+
+def return_generation(file_name):
+    """
+    Returns the generation number of a cached file. This changes every time
+    the file is parsed from scratch, so modules that build their own
+    structures from the records can tell when they need to rebuild them.
+
+    Parameters:
+    file_name (string): The file to return the generation of.
+
+    Returns:
+    (int): The generation of the cached file, or 0 if it is not cached.
+    """
+    cached = cached_files.get(file_name)
+    if cached == None:
+        return 0
+    return cached["generation"]
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.cache
+    #The tests use their own file, which is removed afterwards.
+    test_file = "cache_test.txt"
+    data_file = open(test_file,"w")
+    data_file.write("1, first, -         \n2, second, -         ")
+    data_file.close()
+    print(read_records(test_file))
+    #Reading an unchanged file again gives the cached records
+    print(read_records(test_file) is read_records(test_file))
+    print(write_fields(test_file,[(1,"12/10/2026")]))
+    #Values wider than their field are not written
+    print(write_fields(test_file,[(0,"too wide for the field")]))
+    print(read_field(test_file,1))
+    text = "\n3, third, -         "
+    data_file = open(test_file,"a")
+    data_file.write(text)
+    data_file.close()
+    append_records(test_file,[["3","third","-"]],[text])
+    #After changing and appending to the file, the cache must hold
+    #exactly what parsing the file from scratch gives
+    print(cached_files.get(test_file) != None)
+    print((cached_files[test_file]["records"],cached_files[test_file]\
+           ["fields"]) == parse_file(test_file))
+    generation = return_generation(test_file)
+    invalidate(test_file)
+    read_records(test_file)
+    print(return_generation(test_file) > generation)
+    os.remove(test_file)
+    os.remove(test_file+".lock")
@@ -0,0 +1,127 @@
+"""
+NAME
+    coborrow
+
+DESCRIPTION
+    Keeps a count, for every pair of books, of how many members have
+    borrowed both of them, so that books can be recommended on the basis
+    of "members who borrowed this also borrowed".
+    Most pairs of books are never borrowed by the same member, so only the
+    pairs that have been are stored: each book maps to the books it has
+    been borrowed alongside and how many members borrowed both.
+    The counts are built from the log once and new entries are then added
+    to them as books are checked out. A member borrowing the same book
+    again does not change any counts.
+
+MODULE CONTENTS
+    build_matrix(entries)
+    add_entries(entries)
+    return_member_books(member_id)
+    return_related(book_ids)
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+import DatabaseFunctions.popularity as popularity
+
+#pairs maps a book ID to a dictionary mapping each book it has been
+#borrowed alongside to the number of members who borrowed both.
+#members maps a member ID to the set of books they have borrowed, and
+#entries is the number of log entries that have been added. Book IDs are
+#stored without leading zeros.
+matrix = {"entries":0,"pairs":{},"members":{}}
+
+def build_matrix(entries):
+    """
+    Builds the counts from scratch from every entry in the log.
+
+    Parameters:
+    entries (list): All entries in the log.
+
+    Returns:
+    void
+    """
+    matrix["pairs"] = {}
+    matrix["members"] = {}
+    matrix["entries"] = 0
+    add_entries(entries)
+
+def add_entries(entries):
+    """
+    Adds new log entries to the counts. Each new book a member borrows is
+    paired with every book they have borrowed before.
+
+    Parameters:
+    entries (list): The log entries added since the last were added.
+
+    Returns:
+    void
+    """
+    pairs = matrix["pairs"]
+    members = matrix["members"]
+    for entry in entries:
+        #Entry[0] is the book ID and entry[1] is the member ID
+        book_id = popularity.return_book_key(entry[0])
+        borrowed = members.setdefault(entry[1],set())
+        if book_id in borrowed:
+            continue
+        row = pairs.setdefault(book_id,{})
+        for other_id in borrowed:
+            row[other_id] = row.get(other_id,0)+1
+            other_row = pairs[other_id]
+            other_row[book_id] = other_row.get(book_id,0)+1
+        borrowed.add(book_id)
+    matrix["entries"] += len(entries)
+
+def return_member_books(member_id):
+    """
+    Returns the books a member has borrowed.
+
+    Parameters:
+    member_id (string): The ID of the member.
+
+    Returns:
+    (set): The IDs of the books, without leading zeros.
+    """
+    return matrix["members"].get(member_id,set())
+
+def return_related(book_ids):
+    """
+    Adds up, for every other book, how many times it was borrowed by the
+    same member as one of the given books. Only the books that have been
+    borrowed alongside one of them are looked at.
+
+    Parameters:
+    book_ids (set): The IDs of the books to start from, without leading
+    zeros. These are left out of the result.
+
+    Returns:
+    related (dict): Maps the ID of each related book to its total.
+    """
+    related = {}
+    for book_id in book_ids:
+        for other_id,count in matrix["pairs"].get(book_id,{}).items():
+            if other_id not in book_ids:
+                related[other_id] = related.get(other_id,0)+count
+    return related
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.coborrow
+    #logfile.txt must be in the LibraryFunctions folder for tests to work.
+    import DatabaseFunctions.cache as cache
+    entries = cache.read_records("logfile.txt")
+    build_matrix(entries)
+    print(return_member_books("coai"))
+    print(return_related(return_member_books("coai")))
+    all_pairs = matrix["pairs"]
+    #Adding the log in two parts must give the same counts
+    build_matrix(entries[:len(entries)//2])
+    add_entries(entries[len(entries)//2:])
+    print(matrix["pairs"] == all_pairs)
+    #Each pair must be counted the same way round
+    print(all(matrix["pairs"][other_id][book_id] == count
+              for book_id,row in matrix["pairs"].items()
+              for other_id,count in row.items()))
@@ -1,292 +1,1123 @@
-"""
-NAME
-    database
-    
-DESCRIPTION
-    Contains all functions that directly access or alter the
-    database.txt and logfile.txt files.
-    This is designed to prevent other modules from needing to
-    access the database or loogfile directly.
-    Also contains input validation functions.
-
-MODULE CONTENTS
-    return_database()
-    return_availability(book_id)
-    update_availability(book_id, member_id)
-    return_log()
-    return_overdue()
-    add_log_entry(book_id,member_id)
-    update_log(book_id)
-    validate_member_id(member_id)
-    validate_book_id(book_id)
-
-AUTHOR
-    Olivia Gray
-    20/11/2021
-"""
-
-from datetime import date
-
-database_file = "database.txt"
-log_file = "logfile.txt"
-
-def return_database():
-    """
-    Returns a list of all records from database.txt.
-
-    Returns:
-    records (list): The list of all records of books.
-    
-    """
-
-    records = []
-    try:
-        database = open(database_file,"r")
-        for line in database:
-            record = line.strip().split(", ")
-            records.append(record)
-        database.close()
-        return records
-    except:
-        return []
-
-def return_availability(book_id):
-    """
-    Returns the value in the member_id field of
-    the record with the given book_id.
-
-    Parameters:
-    book_id (string): The book ID to check the availability of. 
-
-    Returns:
-    availability (string): String representing the book is
-    available or who currently has it.
-    
-    """
-    
-    #book_id corresponds to the index of the records list
-    #book_id is 1-indexed, whereas records is 0-indexed
-    #index 5 within each record refers to the member_id field
-    return return_database()[int(book_id)-1][5]
-
-def update_availability(book_id, member_id):
-    """
-    Modifies the database text document with up-to-date details of
-    whether a book is on loan or not. It works both ways: updating when
-    a book is taken out and when it is returned (in this case, 0 is given
-    as the member ID).
-
-    Parameters:
-    book_id (string): the ID of the book whose availability needs updating.
-    member_id (string): the ID of the member who currently has the book;
-    this value will be given as '0' if the book is being returned and will
-    be made available again.
-
-    Returns:
-    void
-
-    """
-    books = return_database()
-    books[int(book_id)-1][5] = member_id
-
-    #Change list into one correctly formatted string for file
-    updated_books = []
-    for record in books:
-        line = ", ".join(record)
-        updated_books.append(line)
-    updated_books = "\n".join(updated_books)
-
-    try:
-        database = open(database_file,"w")
-        database.write(updated_books)
-        database.close()
-    except:
-        return "Writing to file failed - file not found"
-
-def return_log():
-    """
-    Returns a list of all entries in the log.
-    The log contains information relating to books being withdrawn and returned
-    and which member did this.
-
-    Returns:
-    records (list): List of all records in the log.
-    
-    """
-    records = []
-    try:
-        log = open(log_file,"r")
-        for line in log:
-            record = line.strip().split(", ")
-            records.append(record)
-        log.close()
-        return records
-    except:
-        return []
-
-def return_overdue():
-    """
-    Returns a list of books that have been on loan for more than 60 days.
-    This function will use Python's standard datetime library to
-    calculate the difference between 2 dates.
-
-    Returns:
-    overdue_books (list): List containing all books that have been borrowed
-    for more than 60 days.
-
-    """
-
-    #Read through logfile, but only need to check for overdue books when they
-    #have not yet been returned (represented by '-' in the return date field
-    #index 3 within each record refers to the return date field
-    overdue_books = []
-    current_date = date.today()
-    for record in return_log():
-        if record[3] == "-":
-            #Convert checkout_date to year, month, day format and
-            #check if loaned for longer than 60 days
-            checkout_field = record[2].split("/")
-            checkout_date = date(int(checkout_field[2]),\
-                                 int(checkout_field[1]),int(checkout_field[0]))
-            if (current_date-checkout_date).days > 60:
-                overdue_books.append(record)
-    return overdue_books
-
-def add_log_entry(book_id,member_id):
-    """
-    Appends a new line to the log file when the librarian checks out a book.
-
-    Parameters:
-    book_id (string): The ID of the book being withdrawn.
-    member_id (string): The ID of the member withdrawing the book.
-
-    Returns:
-    void
-
-    """
-    #Convert datetime format (yyyy-mm-dd) to dd/mm/yyyy.
-    current_date = str(date.today()).split("-")
-    checkout_date = current_date[2]+"/"\
-            +current_date[1]+"/"+current_date[0]
-    #Create the new line for the log,
-    #with book ID, member ID, checkout date format.
-    entry = "\n" + str(book_id) + ", " + member_id + ", "\
-            + checkout_date + ", -"
-    try:
-        log = open(log_file,"a")
-        log.write(entry)
-        log.close()
-    except:
-        return "file not found"
-
-def update_log(book_id):
-    """
-    Modifies the log text file when a book is returned so the correct
-    entry will now include its return date.
-
-    Parameters:
-    book_id (string): The ID of the book being returned.
-
-    Returns:
-    void
-
-    """
-    
-    updated_log = []
-    for entry in return_log():
-        #Checks that the given book ID has been taken out
-        #Entry[0] is book ID and Entry[3]is return date,
-        #which will be "-" if the book has not yet been returned.
-        if entry[0] == str(book_id) and entry[3]=="-":
-            current_date = str(date.today()).split("-")
-            entry[3] = current_date[2]+"/"+current_date[1]+"/"+current_date[0]
-        updated_log.append(", ".join(entry))
-
-    updated_log = "\n".join(updated_log)
-    
-    try:
-        log = open(log_file,"w")
-        log.write(updated_log)
-        log.close()
-    except:
-        return "file not found"
-
-def validate_member_id(member_id):
-    """
-    Returns a boolean value representing whether a given member_id
-    has passed the validation checks.
-
-    Parameters:
-    member_id (string): The member ID to be validated.
-
-    Returns:
-    (bool): Boolean representing that the
-    member ID has passed validation checks or not.
-    """
-
-    #To pass validity checks:
-        #ID must be length 4
-        #ID must be lowercase
-        #ID must only contain alphabetical characters
-        #(i.e. no numbers or symbols)
-
-    if len(member_id) != 4:
-        return False
-    elif member_id.lower() != member_id:
-        return False
-    else:
-        for i in member_id:
-            #Ord() converts a character to its ASCII value
-            #ASCII values 98-121 are the lowercase alphabet.
-            if ord(i) < 97 or ord(i) > 122:
-                return False
-    return True
-    
-def validate_book_id(book_id):
-    """
-    Checks that the book ID the user inputs is valid according to the rules
-    of the database text file.
-
-    Parameters:
-    book_id (string): the ID of the book to validate.
-
-    Returns:
-    (bool): Boolean value representing whether the given book ID passes
-    the validation checks.
-    
-    """
-    
-    #To pass validity check:
-        #ID must be between 1 and number of records in database
-        #ID must only contain numbers
-    for i in str(book_id):
-        #ASCII values 49-56 are numbers 0-9
-        if ord(i) < 48 or ord(i) > 57:
-            return False
-    if int(book_id) < 1 or int(book_id) > len(return_database()):
-        return False            
-    return True
-
-if __name__=="__main__":
-    #To test this code, the database.txt and logfile.txt
-    #need to moved into the DatabaseFunctions sub-package
-    #This module must be accessed through modules in
-    #LibraryFunctions which apply input validation
-    #Therefore, erroneous data should not be used in these tests.
-    print(return_database())
-    print(return_availability(1))
-    print(return_availability(24))
-    print(return_log())
-    print(return_overdue())
-    print(validate_member_id("coai"))
-    print(validate_member_id("12mn"))
-    print(validate_member_id("lmnpq"))
-    print(validate_member_id("12345"))
-    print(validate_book_id("12"))
-    print(validate_book_id("24"))
-    print(validate_book_id("100"))
-    print(validate_book_id("1o"))
-          
-          
-    
-
+"""
+NAME
+    database
+    
+DESCRIPTION
+    Contains all functions that directly access or alter the
+    database.txt and logfile.txt files.
+    This is designed to prevent other modules from needing to
+    access the database or loogfile directly.
+    Also contains input validation functions.
+    Parsed copies of both files are kept in memory by the cache module,
+    and the log is indexed by book and member ID by the logindex module.
+    The number of times each book has been withdrawn is kept by the
+    popularity module and saved to popularity.txt, and the genres each
+    member borrows are kept by the profiles module. The coborrow module
+    counts how many members have borrowed each pair of books, and the
+    readbitmap module records which books each member has read.
+    Dates are converted to day numbers by the dates module once, when
+    the files are loaded, rather than every time they are compared.
+    The same functions can instead be backed by an SQLite database
+    (see the sqlitedb module) by calling use_sqlite(), or by setting the
+    LIBRARY_BACKEND environment variable to "sqlite".
+    Several copies of the program can share the same text files: changes
+    are made while holding a lock on the file (see the locking module), and
+    files that are rewritten in full are replaced all at once.
+    New log entries are written by the logwriter module, which writes the
+    entries of checkouts made at the same time together and syncs them to
+    disk once.
+
+MODULE CONTENTS
+    use_sqlite(file_name)
+    return_database()
+    return_catalog_generation()
+    return_book_position(book_id)
+    return_book_record(book_id)
+    return_purchase_days()
+    return_availability(book_id)
+    update_availability(book_id, member_id)
+    update_availabilities(book_ids, member_id)
+    rewrite_database(changes)
+    return_log()
+    return_log_index()
+    return_log_length()
+    return_log_since(count)
+    return_popularity()
+    return_favourite_genre(member_id)
+    return_coborrowing()
+    return_read_row(member_id)
+    return_log_by_book(book_id)
+    return_log_by_member(member_id)
+    has_member_read(member_id,book_id)
+    return_overdue(days)
+    return_overdue_days(days)
+    return_overdue_by_member(member_id,days)
+    add_log_entry(book_id,member_id)
+    add_log_entries(book_ids,member_id,wait)
+    write_log_entries(records,entries)
+    update_log(book_id)
+    update_logs(book_ids)
+    rewrite_log(book_ids,return_date)
+    write_log(book_ids,return_date)
+    record_checkout(book_id,member_id)
+    record_checkouts(book_ids,member_id)
+    record_return(book_id)
+    record_returns(book_ids)
+    return_member_version(member_id)
+    mark_members_changed(member_ids)
+    validate_member_id(member_id)
+    validate_book_id(book_id)
+
+AUTHOR
+    Olivia Gray
+    20/11/2021
+"""
+
+import DatabaseFunctions.cache as cache
+import DatabaseFunctions.dates as dates
+import DatabaseFunctions.logindex as logindex
+import DatabaseFunctions.popularity as popularity
+import DatabaseFunctions.profiles as profiles
+import DatabaseFunctions.coborrow as coborrow
+import DatabaseFunctions.readbitmap as readbitmap
+import DatabaseFunctions.locking as locking
+import DatabaseFunctions.logwriter as logwriter
+import DatabaseFunctions.sqlitedb as sqlitedb
+import os
+import threading
+
+database_file = "database.txt"
+log_file = "logfile.txt"
+popularity_file = "popularity.txt"
+#Which storage the functions below use: "text" for database.txt and
+#logfile.txt, or "sqlite" for the SQLite database file (see use_sqlite).
+backend = "text"
+sqlite_file = "library.db"
+#The return date of a book still on loan is written as "-" padded with
+#spaces to the width of a dd/mm/yyyy date, so that it can be overwritten
+#in place when the book is returned.
+date_field_width = 10
+#The member_id field of each book is padded to the width of a member ID
+#for the same reason.
+member_field_width = 4
+#How many days a book can be on loan before it is overdue.
+loan_period = 60
+#Maps each book ID to the index of its record in database.txt. This is
+#rebuilt whenever database.txt has been parsed again.
+catalog_positions = {"generation":None,"positions":{}}
+#Counts how many times each member has checked out or returned books, so
+#anything worked out for a member can tell when it is out of date.
+member_versions = {}
+#The purchase date of each record in the database as a day number, in the
+#same order as the records. This is rebuilt whenever the database changes.
+purchase_days = {"generation":None,"days":[]}
+#Held by a thread while it checks books are available and marks them as
+#checked out or returned, so two threads cannot take the same book.
+operation_lock = threading.RLock()
+
+def use_sqlite(file_name=sqlite_file):
+    """
+    Switches every function in this module over to an SQLite database.
+    The first time the database is used, the contents of database.txt
+    and logfile.txt are copied into it.
+
+    Parameters:
+    file_name (string): The SQLite database file to use.
+
+    Returns:
+    void
+
+    """
+    global backend
+    sqlitedb.connect(file_name)
+    sqlitedb.migrate(database_file,log_file)
+    backend = "sqlite"
+
+def return_database():
+    """
+    Returns a list of all records from database.txt.
+    The records are cached, so the file is only read again when it changes.
+    The returned list is shared with the cache and must not be modified.
+
+    Returns:
+    records (list): The list of all records of books.
+    
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_database()
+    return cache.read_records(database_file)
+
+def return_catalog_generation():
+    """
+    Returns a value that changes whenever the list of books has to be read
+    again because it has changed. Modules that build their own structures
+    from the books use this to tell when to update them.
+
+    Returns:
+    generation: The current generation of the database.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_generation()
+    return_database()
+    return cache.return_generation(database_file)
+
+def return_book_position(book_id):
+    """
+    Returns the line of database.txt that holds the record
+    with the given book ID.
+
+    Parameters:
+    book_id (string): The ID of the book to find.
+
+    Returns:
+    position (int): The index of the book's record, or None if the
+    library does not own a book with that ID.
+    
+    """
+    #Use the cached records if there are any, without checking whether the
+    #file has changed, as availability changes do not move any records.
+    if cache.return_cached_records(database_file) == None:
+        return_database()
+    generation = cache.return_generation(database_file)
+    if catalog_positions["generation"] != generation:
+        positions = {}
+        records = cache.return_cached_records(database_file) or []
+        for i in range(len(records)):
+            try:
+                positions[int(records[i][0])] = i
+            except ValueError:
+                pass
+        catalog_positions["positions"] = positions
+        catalog_positions["generation"] = generation
+    try:
+        return catalog_positions["positions"].get(int(book_id))
+    except ValueError:
+        return None
+
+def return_book_record(book_id):
+    """
+    Returns the record of the book with the given ID.
+
+    Parameters:
+    book_id (string): The ID of the book to return.
+
+    Returns:
+    record (list): The book's record, or None if the library does not
+    own a book with that ID.
+    
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_book_record(book_id)
+    position = return_book_position(book_id)
+    if position == None:
+        return None
+    return return_database()[position]
+
+def return_purchase_days():
+    """
+    Returns the purchase date of every book as a day number, in the same
+    order as the records returned by return_database(). The dates are only
+    converted again when the database has changed.
+
+    Returns:
+    days (list): The day number of each book's purchase date.
+
+    """
+    generation = return_catalog_generation()
+    if purchase_days["generation"] != generation:
+        #Index 4 within each record refers to the purchase date
+        purchase_days["days"] = [dates.parse_day(record[4])
+                                 for record in return_database()]
+        purchase_days["generation"] = generation
+    return purchase_days["days"]
+
+def return_availability(book_id):
+    """
+    Returns the value in the member_id field of
+    the record with the given book_id.
+    The field is read straight from its position in database.txt,
+    so the rest of the file does not need to be read.
+
+    Parameters:
+    book_id (string): The book ID to check the availability of. 
+
+    Returns:
+    availability (string): String representing the book is
+    available or who currently has it.
+    
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_availability(book_id)
+    
+    #The member_id field is the last field of each record
+    return cache.read_field(database_file,return_book_position(book_id))
+
+def update_availability(book_id, member_id):
+    """
+    Modifies the database text document with up-to-date details of
+    whether a book is on loan or not. It works both ways: updating when
+    a book is taken out and when it is returned (in this case, 0 is given
+    as the member ID).
+    The member_id field is padded to the width of a member ID, so it is
+    overwritten in place rather than rewriting the whole file.
+
+    Parameters:
+    book_id (string): the ID of the book whose availability needs updating.
+    member_id (string): the ID of the member who currently has the book;
+    this value will be given as '0' if the book is being returned and will
+    be made available again.
+
+    Returns:
+    void
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.update_availability(book_id,member_id)
+    return update_availabilities([book_id],member_id)
+
+def update_availabilities(book_ids, member_id):
+    """
+    Changes the member_id field of several books at once, opening
+    database.txt only once to write all of the changes.
+
+    Parameters:
+    book_ids (list): The IDs of the books whose availability needs updating.
+    member_id (string): the ID of the member who now has the books, or '0'
+    if the books are being returned.
+
+    Returns:
+    void
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.update_availabilities(book_ids,member_id)
+    locking.acquire_lock(database_file,True)
+    try:
+        #The positions are found once the file is locked, reading it again
+        #if another desk has changed it, so they cannot go out of date.
+        changes = []
+        for book_id in book_ids:
+            changes.append((return_book_position(book_id),member_id))
+        #Files written before the padding was introduced may have a field
+        #too narrow to hold a member ID, so the file has to be rewritten.
+        if cache.write_fields(database_file,changes) == False:
+            return rewrite_database(changes)
+    except:
+        cache.invalidate(database_file)
+        return "Writing to file failed - file not found"
+    finally:
+        locking.release_lock(database_file)
+
+def rewrite_database(changes):
+    """
+    Rewrites the whole of database.txt, changing the member_id field of the
+    given records and padding the member_id field of every record to the
+    width of a member ID so later changes can be written in place.
+    The positions must have been found while database.txt was locked by
+    the caller, so they match the file being rewritten.
+
+    Parameters:
+    changes (list): The (record index, new member_id) of each record
+    to change.
+
+    Returns:
+    void
+
+    """
+    locking.acquire_lock(database_file,True)
+    try:
+        #Copy the records so the cache is not changed if writing fails
+        books = [list(record) for record in return_database()]
+        for position,member_id in changes:
+            books[position][5] = member_id
+
+        #Change list into one correctly formatted string for file
+        updated_books = []
+        for record in books:
+            record[5] = record[5].ljust(member_field_width)
+            line = ", ".join(record)
+            updated_books.append(line)
+        updated_books = "\n".join(updated_books)
+
+        #The new file is renamed over the old one, so a crash part way
+        #through writing it cannot leave the database cut short.
+        locking.replace_file(database_file,updated_books)
+        cache.replace_records(database_file,books)
+    except:
+        cache.invalidate(database_file)
+        return "Writing to file failed - file not found"
+    finally:
+        locking.release_lock(database_file)
+
+def return_log():
+    """
+    Returns a list of all entries in the log.
+    The log contains information relating to books being withdrawn and returned
+    and which member did this.
+    The entries are cached, so the file is only read again when it changes.
+    The returned list is shared with the cache and must not be modified.
+
+    Returns:
+    records (list): List of all records in the log.
+    
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_log()
+    return cache.read_records(log_file)
+
+def return_log_index():
+    """
+    Returns the index of the log, making sure it matches the current
+    contents of logfile.txt.
+
+    Returns:
+    index (dict): The log index from the logindex module.
+
+    """
+    entries = return_log()
+    return logindex.return_index(entries,cache.return_generation(log_file))
+
+def return_log_length():
+    """
+    Returns how many entries there are in the log.
+
+    Returns:
+    (int): The number of entries in the log.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_log_length()
+    return len(return_log())
+
+def return_log_since(count):
+    """
+    Returns the entries added to the log after the first given number.
+
+    Parameters:
+    count (int): How many entries to skip.
+
+    Returns:
+    entries (list): The later entries, in the order they appear in the log.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_log_since(count)
+    return return_log()[count:]
+
+def return_popularity():
+    """
+    Returns the number of times each book and each title has been
+    withdrawn. The counts are loaded from popularity.txt the first time
+    they are used, and only the log entries added since they were last
+    saved are counted. They are rebuilt from the whole log if the file is
+    missing or covers more entries than the log has, and the title counts
+    are added up again if the title of a book has changed.
+
+    Returns:
+    counts (dict): The counts from the popularity module. counts["books"]
+    maps a book ID to the number of times it has been withdrawn, and
+    counts["titles"] maps a lowercase title to the number of times any
+    copy of it has been withdrawn.
+
+    """
+    if popularity.counts["loaded"] == False:
+        popularity.read_counts(popularity_file)
+    #The titles are checked before any new entries are counted, so the
+    #entries are added to the right titles
+    generation = return_catalog_generation()
+    if popularity.counts["catalog_generation"] != generation:
+        popularity.set_titles(return_database())
+        popularity.counts["catalog_generation"] = generation
+    length = return_log_length()
+    counted = popularity.counts["entries"]
+    if popularity.counts["loaded"] == False or counted > length:
+        popularity.build_counts(return_log())
+    elif counted < length:
+        popularity.add_entries(return_log_since(counted))
+    if popularity.save_due() == True:
+        #The file is only written under the log's lock, so two desks
+        #never write it at once.
+        locking.acquire_lock(log_file,True)
+        try:
+            popularity.write_counts(popularity_file)
+        finally:
+            locking.release_lock(log_file)
+    return popularity.counts
+
+def return_favourite_genre(member_id):
+    """
+    Returns the genre a member has withdrawn most often, or the one they
+    borrowed most recently if several are tied. The member profiles are
+    brought up to date with any log entries added since they were last
+    used, and are only rebuilt if the genre of a book has changed.
+
+    Parameters:
+    member_id (string): The ID of the member.
+
+    Returns:
+    favourite_genre (string): The member's favourite genre, or None if
+    they have never withdrawn a book.
+
+    """
+    generation = return_catalog_generation()
+    if profiles.profiles["catalog_generation"] != generation:
+        if profiles.set_genres(return_database()) == True:
+            profiles.build_profiles(return_log())
+        profiles.profiles["catalog_generation"] = generation
+    length = return_log_length()
+    counted = profiles.profiles["entries"]
+    if counted > length:
+        profiles.build_profiles(return_log())
+    elif counted < length:
+        profiles.add_entries(return_log_since(counted))
+    return profiles.return_favourite_genre(member_id)
+
+def return_coborrowing():
+    """
+    Returns the counts of how many members have borrowed each pair of
+    books, first adding any log entries added since they were last used.
+    The counts are rebuilt if the log has fewer entries than were counted.
+
+    Returns:
+    matrix (dict): The counts from the coborrow module.
+
+    """
+    length = return_log_length()
+    counted = coborrow.matrix["entries"]
+    if counted > length:
+        coborrow.build_matrix(return_log())
+    elif counted < length:
+        coborrow.add_entries(return_log_since(counted))
+    return coborrow.matrix
+
+def return_read_row(member_id):
+    """
+    Returns the row of the has-read bitmap for a member, which has bit i
+    set if they have withdrawn the book at position i of the database.
+    The bitmap is brought up to date with any log entries added since it
+    was last used, and is rebuilt if the books in the database have moved.
+
+    Parameters:
+    member_id (string): The ID of the member.
+
+    Returns:
+    row (bytearray): The member's row, which must not be modified, or None
+    if they have never withdrawn a book.
+
+    """
+    generation = return_catalog_generation()
+    if readbitmap.bitmap["catalog_generation"] != generation:
+        if readbitmap.set_books(return_database()) == True:
+            readbitmap.build_bitmap(return_log())
+        readbitmap.bitmap["catalog_generation"] = generation
+    length = return_log_length()
+    counted = readbitmap.bitmap["entries"]
+    if counted > length:
+        readbitmap.build_bitmap(return_log())
+    elif counted < length:
+        readbitmap.add_entries(return_log_since(counted))
+    return readbitmap.return_row(member_id)
+
+def return_log_by_book(book_id):
+    """
+    Returns every log entry for a given book, in the order
+    they appear in the log.
+
+    Parameters:
+    book_id (string): The ID of the book to return the log entries of.
+
+    Returns:
+    entries (list): List of all log entries for the book.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_log_by_book(book_id)
+    entries = return_log()
+    positions = return_log_index()["by_book"].get(str(book_id),[])
+    return [entries[position] for position in positions]
+
+def return_log_by_member(member_id):
+    """
+    Returns every log entry for a given member, in the order
+    they appear in the log.
+
+    Parameters:
+    member_id (string): The ID of the member to return the log entries of.
+
+    Returns:
+    entries (list): List of all log entries for the member.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_log_by_member(member_id)
+    entries = return_log()
+    positions = return_log_index()["by_member"].get(member_id,[])
+    return [entries[position] for position in positions]
+
+def has_member_read(member_id,book_id):
+    """
+    Checks whether a member has ever withdrawn a given book.
+
+    Parameters:
+    member_id (string): The ID of the member.
+    book_id (string): The ID of the book.
+
+    Returns:
+    (bool): Whether the member has withdrawn the book before.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.has_member_read(member_id,book_id)
+    return (member_id,str(book_id)) in return_log_index()["read_pairs"]
+
+def return_overdue(days=loan_period):
+    """
+    Returns a list of books that have been on loan for more than 60 days,
+    or another number of days if one is given.
+    The log index keeps the open loans in order of checkout date, so only
+    the loans that are actually overdue need to be looked at.
+
+    Parameters:
+    days (int): How many days a book can be on loan before it is overdue.
+
+    Returns:
+    overdue_books (list): List containing all books that have been borrowed
+    for more than the given number of days.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_overdue(days)
+    return [entry for entry,overdue_by in return_overdue_days(days)]
+
+def return_overdue_days(days=loan_period):
+    """
+    Returns every book that has been on loan for more than 60 days, or
+    another number of days if one is given, along with how many days
+    past that it has been on loan.
+
+    Parameters:
+    days (int): How many days a book can be on loan before it is overdue.
+
+    Returns:
+    overdue_books (list): A (log entry, days overdue) tuple for each
+    overdue book, in the order they appear in the log.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_overdue_days(days)
+    today = dates.return_today()
+    entries = return_log()
+    checkout_days = return_log_index()["checkout_days"]
+    overdue_books = []
+    #A book is overdue if it was checked out before this day
+    for position in logindex.return_loans_before(today-days):
+        overdue_books.append((entries[position],\
+                              today-checkout_days[position]-days))
+    return overdue_books
+
+def return_overdue_by_member(member_id,days=loan_period):
+    """
+    Returns a list of books that a given member has had on loan
+    for more than 60 days, or another number of days if one is given.
+
+    Parameters:
+    member_id (string): The ID of the member to check.
+    days (int): How many days a book can be on loan before it is overdue.
+
+    Returns:
+    overdue_books (list): List containing the log entries of every book
+    the member has borrowed for more than the given number of days.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.return_overdue_by_member(member_id,days)
+    today = dates.return_today()
+    entries = return_log()
+    index = return_log_index()
+    overdue_books = []
+    for position in index["by_member"].get(member_id,[]):
+        #Loans that are still open have no return day
+        if (index["return_days"][position] == None
+            and today-index["checkout_days"][position] > days):
+            overdue_books.append(entries[position])
+    return overdue_books
+
+def add_log_entry(book_id,member_id):
+    """
+    Appends a new line to the log file when the librarian checks out a book.
+
+    Parameters:
+    book_id (string): The ID of the book being withdrawn.
+    member_id (string): The ID of the member withdrawing the book.
+
+    Returns:
+    void
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.add_log_entry(book_id,member_id)
+    return add_log_entries([book_id],member_id)
+
+def add_log_entries(book_ids,member_id,wait=True):
+    """
+    Appends a new line to the log file for each of several books checked
+    out by the same member. The lines are handed to the logwriter module,
+    which writes them along with those of any other checkouts made at the
+    same time.
+
+    Parameters:
+    book_ids (list): The IDs of the books being withdrawn.
+    member_id (string): The ID of the member withdrawing the books.
+    wait (bool): Whether to wait until the lines are written and synced
+    to disk before returning.
+
+    Returns:
+    ticket (dict): If not waiting, the ticket to give to
+    logwriter.wait_for to wait for the lines to be written.
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.add_log_entries(book_ids,member_id)
+    checkout_date = dates.format_day(dates.return_today())
+    #Create the new lines for the log,
+    #with book ID, member ID, checkout date format.
+    entries = []
+    records = []
+    for book_id in book_ids:
+        entries.append("\n" + str(book_id) + ", " + member_id + ", "\
+                       + checkout_date + ", " + "-".ljust(date_field_width))
+        records.append([str(book_id),member_id,checkout_date,"-"])
+    logwriter.commit_function = write_log_entries
+    ticket = logwriter.submit(records,entries)
+    if wait == False:
+        return ticket
+    return logwriter.wait_for(ticket)
+
+def write_log_entries(records,entries):
+    """
+    Appends a batch of new entries to the log file with a single write,
+    and syncs the file to disk. The log index, the popularity counts, the
+    member profiles, the co-borrowing counts and the has-read bitmap are
+    updated with the new entries. This is called by the logwriter module.
+
+    Parameters:
+    records (list): The new entries, as lists of fields.
+    entries (list): The line of the log file for each entry.
+
+    Returns:
+    void
+
+    """
+    locking.acquire_lock(log_file,True)
+    try:
+        log = open(log_file,"a")
+        log.write("".join(entries))
+        log.flush()
+        os.fsync(log.fileno())
+        log.close()
+        cache.append_records(log_file,records,entries)
+        first_position = len(return_log())-len(records)
+        for i in range(len(records)):
+            logindex.add_entry(records[i],first_position+i,\
+                               cache.return_generation(log_file))
+        #Only count the new entries if everything before them is counted
+        if (popularity.counts["loaded"] == True
+            and popularity.counts["entries"] == first_position):
+            popularity.add_entries(records)
+            #Saved now and then rather than every time, as the entries
+            #since it was saved can be counted from the log again.
+            if popularity.save_due() == True:
+                popularity.write_counts(popularity_file)
+        if profiles.profiles["entries"] == first_position:
+            profiles.add_entries(records)
+        if coborrow.matrix["entries"] == first_position:
+            coborrow.add_entries(records)
+        if readbitmap.bitmap["entries"] == first_position:
+            readbitmap.add_entries(records)
+    except:
+        cache.invalidate(log_file)
+        return "file not found"
+    finally:
+        locking.release_lock(log_file)
+
+def update_log(book_id):
+    """
+    Modifies the log text file when a book is returned so the correct
+    entry will now include its return date.
+    The log index records where the book's open entry is in the file, so
+    the return date is written over the padded "-" in place and the rest
+    of the log is not read or rewritten.
+
+    Parameters:
+    book_id (string): The ID of the book being returned.
+
+    Returns:
+    void
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.update_log(book_id)
+    return update_logs([book_id])
+
+def update_logs(book_ids):
+    """
+    Adds today's date as the return date of the open entries of several
+    books, opening the log file only once to write all of the dates.
+
+    Parameters:
+    book_ids (list): The IDs of the books being returned.
+
+    Returns:
+    void
+
+    """
+    if backend == "sqlite":
+        return sqlitedb.update_logs(book_ids)
+    return_day = dates.return_today()
+    return_date = dates.format_day(return_day)
+    book_ids = [str(book_id) for book_id in book_ids]
+    #A book may have been checked out by an entry still waiting to be
+    #written, which has to be in the log before its loan can be closed.
+    #If this thread holds the log's lock, the writer needs to borrow it.
+    locking.lend_lock(log_file,logwriter.writer["thread"])
+    logwriter.wait_for_all()
+    locking.acquire_lock(log_file,True)
+    try:
+        open_loans = return_log_index()["open_loans"]
+        changes = []
+        for book_id in book_ids:
+            for position in open_loans.get(book_id,[]):
+                changes.append((position,return_date))
+        #Open entries written before the padding was introduced are
+        #too narrow to hold a date, so the log has to be rewritten.
+        if cache.write_fields(log_file,changes) == False:
+            return rewrite_log(book_ids,return_date)
+        for book_id in book_ids:
+            logindex.close_loans(book_id,return_day)
+    except:
+        cache.invalidate(log_file)
+        return "file not found"
+    finally:
+        locking.release_lock(log_file)
+
+def rewrite_log(book_ids,return_date):
+    """
+    Rewrites the whole log file, adding a return date to the open entries
+    of the given books and padding the return date field of every other
+    open entry so later returns can be written in place.
+
+    Parameters:
+    book_ids (list): The IDs of the books being returned.
+    return_date (string): The date the books were returned (dd/mm/yyyy).
+
+    Returns:
+    void
+
+    """
+    book_ids = set(book_ids)
+    locking.acquire_lock(log_file,True)
+    try:
+        return write_log(book_ids,return_date)
+    finally:
+        locking.release_lock(log_file)
+
+def write_log(book_ids,return_date):
+    """
+    Writes the rewritten log for rewrite_log, which must already hold an
+    exclusive lock on the log file.
+
+    Parameters:
+    book_ids (set): The IDs of the books being returned.
+    return_date (string): The date the books were returned (dd/mm/yyyy).
+
+    Returns:
+    void
+
+    """
+    updated_log = []
+    for entry in return_log():
+        #Entry[0] is book ID and Entry[3]is return date,
+        #which will be "-" if the book has not yet been returned.
+        if entry[0] in book_ids and entry[3]=="-":
+            entry = entry[:3]+[return_date]
+        elif entry[3]=="-":
+            entry = entry[:3]+["-".ljust(date_field_width)]
+        updated_log.append(", ".join(entry))
+
+    updated_log = "\n".join(updated_log)
+
+    try:
+        #The new log is renamed over the old one, so a crash part way
+        #through writing it cannot leave the log cut short.
+        locking.replace_file(log_file,updated_log)
+    except:
+        return "file not found"
+    finally:
+        #The positions of the entries have changed,
+        #so the log is parsed again the next time it is used.
+        cache.invalidate(log_file)
+
+def record_checkout(book_id,member_id):
+    """
+    Checks out a book if it is available, adding it to the log and
+    marking it as withdrawn by the member.
+
+    Parameters:
+    book_id (string): The ID of the book being withdrawn.
+    member_id (string): The ID of the member withdrawing the book.
+
+    Returns:
+    (bool): Whether the book was available and has been checked out.
+
+    """
+    return record_checkouts([book_id],member_id)[0]
+
+def record_checkouts(book_ids,member_id):
+    """
+    Checks out every available book in a list for the same member.
+    Availability is checked while both files are locked, then all of the
+    log entries are added in one write and all of the availability
+    changes are made in one more. The log entries are written by the log
+    writer, along with any others handed to it in the meantime, while this
+    thread lends it the log's lock and waits.
+
+    Parameters:
+    book_ids (list): The IDs of the books being withdrawn.
+    member_id (string): The ID of the member withdrawing the books.
+
+    Returns:
+    checked_out (list): A bool for each book ID, showing whether that book
+    was available and has been checked out. If the same book is given more
+    than once, only its first occurrence is checked out.
+
+    """
+    if backend == "sqlite":
+        checked_out = sqlitedb.record_checkouts(book_ids,member_id)
+        if True in checked_out:
+            mark_members_changed([member_id])
+        return checked_out
+    #Both files stay locked from checking the books are available until
+    #they have been changed, so two desks cannot check out the same book.
+    #The database is always locked before the log to avoid deadlock.
+    locking.acquire_lock(database_file,True)
+    locking.acquire_lock(log_file,True)
+    try:
+        ticket = None
+        with operation_lock:
+            return_database()
+            checked_out = []
+            withdrawn_ids = []
+            withdrawn_positions = set()
+            for book_id in book_ids:
+                position = return_book_position(book_id)
+                #The member_id field is read from the file itself, in case
+                #another desk changed it too recently to change the file's
+                #modification time.
+                if (position != None and position not in withdrawn_positions
+                    and cache.read_field(database_file,position) == "0"):
+                    withdrawn_ids.append(book_id)
+                    withdrawn_positions.add(position)
+                    checked_out.append(True)
+                else:
+                    checked_out.append(False)
+            if withdrawn_ids != []:
+                ticket = add_log_entries(withdrawn_ids,member_id,False)
+                update_availabilities(withdrawn_ids,member_id)
+                mark_members_changed([member_id])
+        #The files stay locked until the log entries are on disk, so other
+        #desks never see the books withdrawn without their entries.
+        if ticket != None:
+            #The log writer needs the log's lock to write the entries
+            locking.lend_lock(log_file,logwriter.writer["thread"])
+            logwriter.wait_for(ticket)
+        return checked_out
+    finally:
+        locking.release_lock(log_file)
+        locking.release_lock(database_file)
+
+def record_return(book_id):
+    """
+    Returns a book if it is on loan, adding the return date to the log and
+    making the book available again.
+
+    Parameters:
+    book_id (string): The ID of the book being returned.
+
+    Returns:
+    (bool): Whether the book was on loan and has been returned.
+
+    """
+    return record_returns([book_id])[0]
+
+def record_returns(book_ids):
+    """
+    Returns every book in a list that is on loan. Availability is checked
+    while both files are locked, then all of the loans are closed in one
+    write to the log and all of the books are made available in one write
+    to the database.
+
+    Parameters:
+    book_ids (list): The IDs of the books being returned.
+
+    Returns:
+    returned (list): A bool for each book ID, showing whether that book
+    was on loan and has been returned. If the same book is given more
+    than once, only its first occurrence is returned.
+
+    """
+    if backend == "sqlite":
+        #Note who has each book before it is returned
+        records = [sqlitedb.return_book_record(book_id) \
+                   for book_id in book_ids]
+        returned = sqlitedb.record_returns(book_ids)
+        mark_members_changed([records[i][5] for i in range(len(book_ids))
+                              if returned[i] == True])
+        return returned
+    #Both files stay locked from checking the books are on loan until
+    #they have been changed, so two desks cannot return the same book.
+    locking.acquire_lock(database_file,True)
+    locking.acquire_lock(log_file,True)
+    try:
+        with operation_lock:
+            return_database()
+            returned = []
+            returned_ids = []
+            returned_positions = set()
+            members = []
+            for book_id in book_ids:
+                position = return_book_position(book_id)
+                if position == None or position in returned_positions:
+                    returned.append(False)
+                    continue
+                #The member_id field is read from the file itself, in case
+                #another desk changed it too recently to change the file's
+                #modification time.
+                member_id = cache.read_field(database_file,position)
+                if member_id != "0":
+                    returned_ids.append(book_id)
+                    returned_positions.add(position)
+                    members.append(member_id)
+                    returned.append(True)
+                else:
+                    returned.append(False)
+            if returned_ids != []:
+                update_logs(returned_ids)
+                update_availabilities(returned_ids,"0")
+                mark_members_changed(members)
+            return returned
+    finally:
+        locking.release_lock(log_file)
+        locking.release_lock(database_file)
+
+def return_member_version(member_id):
+    """
+    Returns a number that changes whenever a member checks out or
+    returns a book through this program.
+
+    Parameters:
+    member_id (string): The ID of the member.
+
+    Returns:
+    (int): The member's current version.
+
+    """
+    return member_versions.get(member_id,0)
+
+def mark_members_changed(member_ids):
+    """
+    Changes the version of each given member, so anything worked out
+    for them before now is known to be out of date.
+
+    Parameters:
+    member_ids (list): The IDs of the members who have changed.
+
+    Returns:
+    void
+
+    """
+    for member_id in set(member_ids):
+        member_versions[member_id] = return_member_version(member_id)+1
+
+def validate_member_id(member_id):
+    """
+    Returns a boolean value representing whether a given member_id
+    has passed the validation checks.
+
+    Parameters:
+    member_id (string): The member ID to be validated.
+
+    Returns:
+    (bool): Boolean representing that the
+    member ID has passed validation checks or not.
+    """
+
+    #To pass validity checks:
+        #ID must be length 4
+        #ID must be lowercase
+        #ID must only contain alphabetical characters
+        #(i.e. no numbers or symbols)
+
+    if len(member_id) != 4:
+        return False
+    elif member_id.lower() != member_id:
+        return False
+    else:
+        for i in member_id:
+            #Ord() converts a character to its ASCII value
+            #ASCII values 98-121 are the lowercase alphabet.
+            if ord(i) < 97 or ord(i) > 122:
+                return False
+    return True
+    
+def validate_book_id(book_id):
+    """
+    Checks that the book ID the user inputs is valid according to the rules
+    of the database text file.
+
+    Parameters:
+    book_id (string): the ID of the book to validate.
+
+    Returns:
+    (bool): Boolean value representing whether the given book ID passes
+    the validation checks.
+    
+    """
+    
+    #To pass validity check:
+        #ID must belong to a record in the database
+        #ID must only contain numbers
+    for i in str(book_id):
+        #ASCII values 49-56 are numbers 0-9
+        if ord(i) < 48 or ord(i) > 57:
+            return False
+    if return_book_record(book_id) == None:
+        return False            
+    return True
+
+if os.environ.get("LIBRARY_BACKEND") == "sqlite":
+    use_sqlite()
+
+if __name__=="__main__":
+    #To test this code, the database.txt and logfile.txt
+    #need to moved into the DatabaseFunctions sub-package
+    #This module must be accessed through modules in
+    #LibraryFunctions which apply input validation
+    #Therefore, erroneous data should not be used in these tests.
+    print(return_database())
+    print(return_availability(1))
+    print(return_availability(24))
+    print(return_log())
+    print(return_overdue())
+    print(validate_member_id("coai"))
+    print(validate_member_id("12mn"))
+    print(validate_member_id("lmnpq"))
+    print(validate_member_id("12345"))
+    print(validate_book_id("12"))
+    print(validate_book_id("24"))
+    print(validate_book_id("100"))
+    print(validate_book_id("1o"))
+          
+          
+    
+
@@ -0,0 +1,66 @@
+"""
+NAME
+    dates
+
+DESCRIPTION
+    Converts between the dd/mm/yyyy dates stored in database.txt and
+    logfile.txt and day numbers (proleptic Gregorian ordinals).
+    Dates are converted to day numbers once when the files are loaded,
+    so working out how long ago something happened is a subtraction of
+    two integers rather than building date objects every time.
+
+MODULE CONTENTS
+    parse_day(date_string)
+    format_day(day)
+    return_today()
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+from datetime import date
+
+def parse_day(date_string):
+    """
+    Converts a dd/mm/yyyy date into a day number.
+
+    Parameters:
+    date_string (string): The date to convert. The day and month do not
+    need to be padded with zeros.
+
+    Returns:
+    (int): The day number of the date.
+    """
+    date_fields = date_string.split("/")
+    return date(int(date_fields[2]),int(date_fields[1]),\
+                int(date_fields[0])).toordinal()
+
+def format_day(day):
+    """
+    Converts a day number back into a dd/mm/yyyy date, in the format
+    written to the files.
+
+    Parameters:
+    day (int): The day number to convert.
+
+    Returns:
+    (string): The date, with the day and month padded to two digits.
+    """
+    day = date.fromordinal(day)
+    return "%02d/%02d/%04d" % (day.day,day.month,day.year)
+
+def return_today():
+    """
+    Returns today's day number.
+
+    Returns:
+    (int): The day number of today's date.
+    """
+    return date.today().toordinal()
+
+if __name__ == "__main__":
+    print(parse_day("13/3/2020"))
+    print(format_day(parse_day("13/3/2020")))
+    print(parse_day("1/1/2021")-parse_day("31/12/2020"))
+    print(format_day(return_today()) == date.today().strftime("%d/%m/%Y"))
@@ -0,0 +1,346 @@
+"""
+NAME
+    locking
+
+DESCRIPTION
+    Stops several copies of the program, such as the menus on different
+    librarian desks, from reading or changing database.txt and logfile.txt
+    while another copy is changing them.
+    Each file has a lock file next to it (database.txt.lock for example).
+    Reading a file takes a shared lock, which any number of readers can
+    hold at once, and changing it takes an exclusive lock, which waits
+    until nobody else holds either kind.
+    A lock can be taken again while it is already held by this program,
+    for example when a checkout changes the database while already holding
+    its lock, and is only let go once every taker has released it. A
+    shared lock can be taken again by any thread of this program, but an
+    exclusive lock only by the thread holding it, so other threads wait
+    just as other programs do. A thread that holds an exclusive lock and
+    waits for another thread to do work for it, such as the log writer,
+    can lend it the lock for that time. A thread waiting for another
+    program to release a lock does not stop other threads taking or
+    releasing locks.
+    A shared lock is never turned into an exclusive one, as fcntl lets go
+    of the shared lock while doing so; an exclusive lock is only taken once
+    every shared one has been released.
+    The number of times a lock had to be waited for, and how long was
+    spent waiting, are counted so that contention can be measured.
+    Locking out other programs uses fcntl, so it only has an effect on
+    Unix-like systems; elsewhere only the threads of this program are kept
+    apart.
+
+MODULE CONTENTS
+    return_held(file_name)
+    return_thread_depths()
+    acquire_lock(file_name, exclusive)
+    release_lock(file_name)
+    lend_lock(file_name, thread)
+    replace_file(file_name, text)
+    return_lock_stats()
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+import os
+import time
+import tempfile
+import threading
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+#Maps a file name to the lock this program holds on it: the open lock
+#file, whether the lock is exclusive, how many times it has been taken,
+#whether a thread is in the middle of taking it, how many threads are
+#waiting to take it exclusively, and the condition used to wait for it.
+#owners maps the ID of each thread that may take an exclusive lock again
+#to how many times it has taken it.
+held_locks = {}
+#How many times each thread has taken each lock, kept separately for
+#every thread.
+thread_holds = threading.local()
+#How many locks have been taken, how many of those had to wait for another
+#program to release the file, and the total seconds spent waiting.
+lock_stats = {"acquired":0,"waits":0,"wait_time":0.0}
+#Stops two threads of this program adding to held_locks or lock_stats at
+#the same time. It is never held while waiting for another program.
+thread_lock = threading.Lock()
+
+def return_held(file_name):
+    """
+    Returns what this program holds of the lock on a file.
+
+    Parameters:
+    file_name (string): The locked file.
+
+    Returns:
+    held (dict): The file's entry in held_locks.
+    """
+    with thread_lock:
+        if file_name not in held_locks:
+            held_locks[file_name] = {"file":None,"exclusive":False,\
+                                     "depth":0,"busy":False,"waiting":0,\
+                                     "owners":{},\
+                                     "condition":threading.Condition()}
+        return held_locks[file_name]
+
+def return_thread_depths():
+    """
+    Returns how many times the current thread has taken each lock.
+
+    Returns:
+    depths (dict): Maps a file name to the number of times.
+    """
+    if not hasattr(thread_holds,"depths"):
+        thread_holds.depths = {}
+    return thread_holds.depths
+
+def acquire_lock(file_name, exclusive):
+    """
+    Takes a lock on a file, waiting until it is free. Every call must be
+    matched by a call to release_lock.
+    If this program already holds a shared lock, an exclusive lock waits
+    until every thread has released the shared one; a thread that holds
+    the shared lock itself cannot ask for an exclusive one. If another
+    thread of this program holds an exclusive lock, this waits until it has
+    been released, unless the lock has been lent to this thread.
+
+    Parameters:
+    file_name (string): The file to lock.
+    exclusive (bool): True to change the file, False to only read it.
+
+    Returns:
+    void
+    """
+    held = return_held(file_name)
+    depths = return_thread_depths()
+    own_depth = depths.get(file_name,0)
+    thread_id = threading.get_ident()
+    condition = held["condition"]
+    with condition:
+        while True:
+            #Another thread is taking the lock from the other programs
+            if held["busy"] == True:
+                condition.wait()
+                continue
+            if held["depth"] == 0:
+                break
+            if held["exclusive"] == True:
+                if thread_id in held["owners"]:
+                    #This thread holds the lock, so it is taken again
+                    held["depth"] += 1
+                    held["owners"][thread_id] += 1
+                    depths[file_name] = own_depth+1
+                    return
+                #Wait for the thread holding it to release it
+                condition.wait()
+                continue
+            if exclusive == False and (held["waiting"] == 0 or own_depth > 0):
+                #This program already holds the lock, so it is taken again
+                held["depth"] += 1
+                depths[file_name] = own_depth+1
+                return
+            if exclusive == True and own_depth > 0:
+                raise RuntimeError("A shared lock on "+file_name+\
+                                   " cannot be made exclusive while held")
+            #Wait for the shared lock to be released, and stop more
+            #readers taking it in the meantime so the wait has an end.
+            if exclusive == True:
+                held["waiting"] += 1
+                condition.wait()
+                held["waiting"] -= 1
+            else:
+                condition.wait()
+        held["busy"] = True
+    #The lock is taken from the other programs without holding any lock
+    #of this program's, so other threads can carry on while this waits.
+    lock_file = None
+    try:
+        try:
+            if fcntl != None:
+                lock_file = open(file_name+".lock","a")
+        except OSError:
+            #The lock file cannot be made here, so go on without a lock
+            lock_file = None
+        if lock_file != None:
+            mode = fcntl.LOCK_EX if exclusive == True else fcntl.LOCK_SH
+            try:
+                fcntl.flock(lock_file.fileno(),mode | fcntl.LOCK_NB)
+                waited = None
+            except BlockingIOError:
+                #Another program holds the lock, so wait for it
+                start = time.perf_counter()
+                fcntl.flock(lock_file.fileno(),mode)
+                waited = time.perf_counter()-start
+            with thread_lock:
+                lock_stats["acquired"] += 1
+                if waited != None:
+                    lock_stats["waits"] += 1
+                    lock_stats["wait_time"] += waited
+    except:
+        if lock_file != None:
+            lock_file.close()
+        with condition:
+            held["busy"] = False
+            condition.notify_all()
+        raise
+    #Only recorded as held once the lock has actually been taken
+    with condition:
+        held["file"] = lock_file
+        held["exclusive"] = exclusive
+        held["depth"] = 1
+        held["owners"] = {thread_id:1} if exclusive == True else {}
+        held["busy"] = False
+        condition.notify_all()
+    depths[file_name] = own_depth+1
+
+def release_lock(file_name):
+    """
+    Releases a lock taken with acquire_lock. The file is only unlocked
+    once it has been released as many times as it was locked.
+
+    Parameters:
+    file_name (string): The file to unlock.
+
+    Returns:
+    void
+    """
+    held = held_locks[file_name]
+    depths = return_thread_depths()
+    depths[file_name] = depths.get(file_name,0)-1
+    thread_id = threading.get_ident()
+    with held["condition"]:
+        held["depth"] -= 1
+        owners = held["owners"]
+        if thread_id in owners:
+            owners[thread_id] -= 1
+            if owners[thread_id] == 0:
+                #Threads it was lent to can only keep it if they have
+                #taken it themselves
+                for owner_id in [owner_id for owner_id in owners
+                                 if owners[owner_id] == 0]:
+                    del owners[owner_id]
+        if held["depth"] == 0:
+            if held["file"] != None:
+                #Closing the lock file releases the lock
+                held["file"].close()
+            held["file"] = None
+            held["exclusive"] = False
+            held["owners"] = {}
+            held["condition"].notify_all()
+
+def lend_lock(file_name, thread):
+    """
+    Lets another thread take an exclusive lock this thread holds, while
+    this thread waits for it to do some work for it. The other thread can
+    take the lock until this thread releases it. Nothing happens if this
+    thread does not hold the lock exclusively.
+
+    Parameters:
+    file_name (string): The locked file.
+    thread (threading.Thread): The thread to lend the lock to, or None.
+
+    Returns:
+    void
+    """
+    if thread == None:
+        return
+    held = return_held(file_name)
+    with held["condition"]:
+        if (held["exclusive"] == True
+            and threading.get_ident() in held["owners"]):
+            held["owners"].setdefault(thread.ident,0)
+            #The thread may already be waiting for the lock
+            held["condition"].notify_all()
+
+def replace_file(file_name, text):
+    """
+    Replaces the contents of a file by writing them to a temporary file and
+    renaming it over the original. The rename happens all at once, so
+    anything reading the file sees either all of the old contents or all
+    of the new, never a partly written file.
+
+    Parameters:
+    file_name (string): The file to replace.
+    text (string): The new contents of the file.
+
+    Returns:
+    void
+    """
+    #Each write gets its own temporary file, so two programs replacing the
+    #same file cannot write into each other's temporary file.
+    folder,base_name = os.path.split(file_name)
+    handle,temp_name = tempfile.mkstemp(prefix=base_name+".",suffix=".tmp",\
+                                        dir=folder or ".")
+    try:
+        temp_file = os.fdopen(handle,"w")
+        try:
+            temp_file.write(text)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        finally:
+            temp_file.close()
+        #The temporary file is only readable by its owner, so give it the
+        #permissions of the file it replaces, or let everyone read a new one.
+        mode = 0o644
+        if os.path.exists(file_name):
+            mode = os.stat(file_name).st_mode & 0o777
+        os.chmod(temp_name,mode)
+        os.replace(temp_name,file_name)
+    except:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+def return_lock_stats():
+    """
+    Returns how often this program has had to wait for a lock.
+
+    Returns:
+    lock_stats (dict): The number of locks taken ("acquired"), how many
+    of them had to wait ("waits") and the total seconds spent waiting
+    ("wait_time").
+    """
+    return dict(lock_stats)
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.locking
+    #The tests use their own file, which is removed afterwards.
+    test_file = "locking_test.txt"
+    def change_file(text):
+        acquire_lock(test_file,True)
+        try:
+            replace_file(test_file,text)
+        finally:
+            release_lock(test_file)
+    change_file("first")
+    acquire_lock(test_file,False)
+    #The lock can be taken again by the thread holding it
+    acquire_lock(test_file,False)
+    print(return_held(test_file)["depth"])
+    #A thread cannot turn its own shared lock into an exclusive one
+    try:
+        acquire_lock(test_file,True)
+        print("Upgraded")
+    except RuntimeError:
+        print("Upgrade refused")
+    #Another thread wanting to change the file waits for the shared lock
+    writer = threading.Thread(target=change_file,args=("second",))
+    writer.start()
+    writer.join(0.2)
+    print(writer.is_alive())
+    release_lock(test_file)
+    release_lock(test_file)
+    writer.join()
+    test_file_handle = open(test_file,"r")
+    print(test_file_handle.read())
+    test_file_handle.close()
+    print(return_held(test_file)["depth"])
+    print(return_lock_stats())
+    os.remove(test_file)
+    if os.path.exists(test_file+".lock"):
+        os.remove(test_file+".lock")
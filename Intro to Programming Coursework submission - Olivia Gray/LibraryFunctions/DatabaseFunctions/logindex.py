@@ -0,0 +1,176 @@
+"""
+NAME
+    logindex
+
+DESCRIPTION
+    Builds and maintains lookup tables over the entries of logfile.txt so
+    that the entries for a single book or member, or the loan a book is
+    currently out on, can be found without scanning the whole log.
+    Loans that have not been returned are also kept in order of their
+    checkout date, so the overdue loans can be found with a binary search.
+    The checkout and return date of every entry are converted to day
+    numbers once, when the entry is added to the index.
+    The index is built once from the cached log and is kept up to date by
+    the database module whenever it adds or changes an entry. It is rebuilt
+    from scratch only when the log has been parsed again.
+
+MODULE CONTENTS
+    build_index(entries, generation)
+    return_index(entries, generation)
+    add_entry(entry, position, generation)
+    close_loans(book_id, return_day)
+    return_loans_before(day)
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+from bisect import bisect_left, insort
+import DatabaseFunctions.dates as dates
+
+#by_book and by_member map an ID to the positions in the log of its
+#entries, in the order they appear in the log. read_pairs holds a
+#(member ID, book ID) tuple for every book a member has ever withdrawn.
+#open_loans maps a book ID to the positions in the log of its entries that
+#have not been returned yet (normally there is only one).
+#checkout_days and return_days hold the day number of the checkout and
+#return date of the entry at each position (None if not yet returned).
+#open_by_date holds a (checkout day, position) tuple for every open entry,
+#sorted by checkout day.
+index = {"generation":None,"by_book":{},"by_member":{},"read_pairs":set(),\
+         "open_loans":{},"checkout_days":[],"return_days":[],\
+         "open_by_date":[]}
+
+def build_index(entries, generation):
+    """
+    Rebuilds the index from every entry in the log.
+
+    Parameters:
+    entries (list): All entries in the log.
+    generation (int): The cache generation the entries were read at.
+
+    Returns:
+    void
+    """
+    index["by_book"] = {}
+    index["by_member"] = {}
+    index["read_pairs"] = set()
+    index["open_loans"] = {}
+    index["checkout_days"] = []
+    index["return_days"] = []
+    index["open_by_date"] = []
+    index["generation"] = generation
+    for position in range(len(entries)):
+        add_entry(entries[position], position, generation)
+
+def return_index(entries, generation):
+    """
+    Returns the index, rebuilding it first if the log has been parsed again
+    since it was last built.
+
+    Parameters:
+    entries (list): All entries in the log.
+    generation (int): The cache generation the entries were read at.
+
+    Returns:
+    index (dict): The up-to-date index.
+    """
+    if index["generation"] != generation:
+        build_index(entries, generation)
+    return index
+
+def add_entry(entry, position, generation):
+    """
+    Adds a single new log entry to the end of the index. If the index was
+    built from a different generation of the log it is left alone, as it
+    will be rebuilt the next time it is used.
+
+    Parameters:
+    entry (list): The log entry to add.
+    position (int): The index of the entry within the log.
+    generation (int): The cache generation the entry belongs to.
+
+    Returns:
+    void
+    """
+    if index["generation"] != generation:
+        return
+    #Entry[0] is the book ID and entry[1] is the member ID.
+    index["by_book"].setdefault(entry[0],[]).append(position)
+    index["by_member"].setdefault(entry[1],[]).append(position)
+    index["read_pairs"].add((entry[1],entry[0]))
+    #Entry[2] is the checkout date and entry[3] is the return date,
+    #which is "-" while the book is on loan.
+    checkout_day = dates.parse_day(entry[2])
+    index["checkout_days"].append(checkout_day)
+    if entry[3] == "-":
+        index["return_days"].append(None)
+        index["open_loans"].setdefault(entry[0],[]).append(position)
+        insort(index["open_by_date"],(checkout_day,position))
+    else:
+        index["return_days"].append(dates.parse_day(entry[3]))
+
+def close_loans(book_id, return_day):
+    """
+    Removes a book from the open loans once it has been returned.
+
+    Parameters:
+    book_id (string): The ID of the returned book.
+    return_day (int): The day number the book was returned on.
+
+    Returns:
+    void
+    """
+    open_by_date = index["open_by_date"]
+    for position in index["open_loans"].pop(book_id, []):
+        index["return_days"][position] = return_day
+        checkout_day = index["checkout_days"][position]
+        del open_by_date[bisect_left(open_by_date,(checkout_day,position))]
+
+def return_loans_before(day):
+    """
+    Returns the positions of every open entry checked out before a
+    given day, using a binary search over the open loans.
+
+    Parameters:
+    day (int): The day number to compare against.
+
+    Returns:
+    positions (list): The positions of the matching entries,
+    in the order they appear in the log.
+    """
+    #(day, -1) sorts before every entry checked out on that day
+    end = bisect_left(index["open_by_date"],(day,-1))
+    return sorted(position for checkout_day,position
+                  in index["open_by_date"][:end])
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.logindex
+    #logfile.txt must be in the LibraryFunctions folder for tests to work.
+    import DatabaseFunctions.cache as cache
+    entries = cache.read_records("logfile.txt")
+    build_index(entries,1)
+    print(index["by_book"].get("1"))
+    print(return_loans_before(dates.return_today()-60))
+    built = dict(index)
+    #Adding the entries one at a time must give the same index as
+    #building it from every entry at once
+    build_index([],2)
+    for position in range(len(entries)):
+        add_entry(entries[position],position,2)
+    print(all(index[key] == built[key] for key in index
+              if key != "generation"))
+    #Entries from another generation of the log are ignored
+    add_entry(["1","test","01/01/2026","-"],len(entries),3)
+    print(len(index["checkout_days"]) == len(entries))
+    if index["open_by_date"] != []:
+        book_id = entries[index["open_by_date"][0][1]][0]
+        close_loans(book_id,dates.return_today())
+        print(book_id not in index["open_loans"])
+    #The open loans must match the entries without a return date
+    print(sorted(position for day,position in index["open_by_date"])
+          == sorted(position for positions in index["open_loans"].values()
+                    for position in positions))
+    print(index["open_by_date"] == sorted(index["open_by_date"]))
@@ -0,0 +1,245 @@
+"""
+NAME
+    logwriter
+
+DESCRIPTION
+    Collects new log entries from checkouts happening at the same time and
+    writes them to logfile.txt together, with a single write and a single
+    fsync, instead of opening and syncing the file once per checkout.
+    Entries are handed to a writer thread, which waits a short time (at
+    most max_delay seconds) for more entries to arrive, or until it has
+    max_batch entries, and then writes them all at once. Whoever handed
+    over the entries can wait until they are safely on disk.
+    The number and size of the batches written and how long entries took
+    to reach the disk are recorded, so the delay and batch size can be
+    tuned.
+    The function that actually writes a batch is given by the database
+    module, which sets commit_function.
+
+MODULE CONTENTS
+    submit(records, texts)
+    wait_for(ticket)
+    wait_for_all()
+    run_writer()
+    commit_batch(batch)
+    return_writer_stats()
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+import threading
+import time
+
+#The longest time, in seconds, the writer waits for more entries before
+#writing a batch, and the most entries it writes in one batch.
+max_delay = 0.002
+max_batch = 64
+#The function that writes a batch of records to the log, given the list
+#of records and the list of their text. Set by the database module.
+commit_function = None
+#pending holds a (records, texts, ticket) tuple for each group of entries
+#waiting to be written, in the order they were handed over. condition is
+#used to wake the writer thread and anyone waiting for it.
+writer = {"pending":[],"pending_entries":0,"thread":None,\
+          "condition":threading.Condition()}
+#The number of batches and entries written, the largest batch, and the
+#total and longest time in seconds from an entry being handed over to it
+#being on disk.
+writer_stats = {"batches":0,"entries":0,"largest_batch":0,\
+                "total_latency":0.0,"max_latency":0.0}
+
+def submit(records, texts):
+    """
+    Hands new log entries to the writer thread, starting it if it is
+    not running yet. The entries are written in the order they are handed
+    over.
+
+    Parameters:
+    records (list): The new log entries.
+    texts (list): The text to write for each entry, each starting with a
+    new line.
+
+    Returns:
+    ticket (dict): Used with wait_for to wait until the entries are on disk.
+    """
+    ticket = {"done":threading.Event(),"error":None,\
+              "submitted":time.perf_counter()}
+    condition = writer["condition"]
+    with condition:
+        if writer["thread"] == None:
+            writer["thread"] = threading.Thread(target=run_writer,\
+                                                daemon=True)
+            writer["thread"].start()
+        writer["pending"].append((records,texts,ticket))
+        writer["pending_entries"] += len(records)
+        condition.notify_all()
+    return ticket
+
+def wait_for(ticket):
+    """
+    Waits until the entries handed over with a ticket have been written
+    to the log and synced to disk.
+
+    Parameters:
+    ticket (dict): The ticket returned by submit.
+
+    Returns:
+    error (string): "file not found" if the entries could not be written,
+    otherwise None.
+    """
+    ticket["done"].wait()
+    return ticket["error"]
+
+def wait_for_all():
+    """
+    Waits until every entry handed over so far has been written.
+
+    Returns:
+    void
+    """
+    with writer["condition"]:
+        tickets = [ticket for records,texts,ticket in writer["pending"]]
+    for ticket in tickets:
+        ticket["done"].wait()
+    #The batch the writer is working on has already left pending
+    with writer["condition"]:
+        writer["condition"].wait_for(lambda: writer["pending_entries"] == 0)
+
+def run_writer():
+    """
+    The writer thread. Waits for entries to be handed over, gives other
+    checkouts up to max_delay seconds to add theirs, then writes them
+    all as one batch.
+
+    Returns:
+    void
+    """
+    condition = writer["condition"]
+    while True:
+        with condition:
+            condition.wait_for(lambda: writer["pending"] != [])
+            deadline = time.perf_counter()+max_delay
+            while writer["pending_entries"] < max_batch:
+                remaining = deadline-time.perf_counter()
+                if remaining <= 0:
+                    break
+                condition.wait(remaining)
+            #Take whole groups until the batch is full, so the entries of
+            #one checkout are always written together
+            batch = []
+            size = 0
+            while writer["pending"] != [] and (batch == [] or size
+                    +len(writer["pending"][0][0]) <= max_batch):
+                group = writer["pending"].pop(0)
+                size += len(group[0])
+                batch.append(group)
+        commit_batch(batch)
+        with condition:
+            writer["pending_entries"] -= size
+            condition.notify_all()
+
+def commit_batch(batch):
+    """
+    Writes a batch of entries with commit_function and lets everyone
+    waiting for them know they are on disk.
+
+    Parameters:
+    batch (list): The (records, texts, ticket) of each group of entries.
+
+    Returns:
+    void
+    """
+    records = []
+    texts = []
+    for group_records,group_texts,ticket in batch:
+        records += group_records
+        texts += group_texts
+    try:
+        error = commit_function(records,texts)
+    except:
+        error = "file not found"
+    now = time.perf_counter()
+    writer_stats["batches"] += 1
+    writer_stats["entries"] += len(records)
+    writer_stats["largest_batch"] = max(writer_stats["largest_batch"],\
+                                        len(records))
+    for group_records,group_texts,ticket in batch:
+        latency = now-ticket["submitted"]
+        writer_stats["total_latency"] += latency*len(group_records)
+        writer_stats["max_latency"] = max(writer_stats["max_latency"],latency)
+        ticket["error"] = error
+        ticket["done"].set()
+
+def return_writer_stats():
+    """
+    Returns measurements of the batches written so far.
+
+    Returns:
+    stats (dict): The number of batches ("batches") and entries
+    ("entries") written, the largest batch ("largest_batch"), the average
+    entries per batch ("average_batch"), and the average and longest
+    seconds from an entry being handed over to it being on disk
+    ("average_latency" and "max_latency").
+    """
+    stats = dict(writer_stats)
+    stats["average_batch"] = 0
+    stats["average_latency"] = 0.0
+    if stats["batches"] > 0:
+        stats["average_batch"] = stats["entries"]/stats["batches"]
+    if stats["entries"] > 0:
+        stats["average_latency"] = stats["total_latency"]/stats["entries"]
+    del stats["total_latency"]
+    return stats
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.logwriter
+    #database.txt and logfile.txt must be in the LibraryFunctions folder
+    #for tests to work. Books are checked out and returned on copies of
+    #them, which are removed afterwards.
+    import os
+    import random
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+    import DatabaseFunctions.database as db
+    import DatabaseFunctions.cache as cache
+    for file_name in ["database.txt","logfile.txt"]:
+        shutil.copy(file_name,"test_"+file_name)
+    db.database_file = "test_database.txt"
+    db.log_file = "test_logfile.txt"
+    db.popularity_file = "test_popularity.txt"
+    available = [record[0] for record in db.return_database()
+                 if record[5] == "0"]
+    #Several desks check out overlapping books at the same time
+    members = ["tst"+str(i) for i in range(8)]
+    requests = [random.sample(available,min(5,len(available)))
+                for member_id in members]
+    with ThreadPoolExecutor(max_workers=len(members)) as pool:
+        results = list(pool.map(db.record_checkouts,requests,members))
+    #Each book must only have been checked out by one desk
+    withdrawn = [requests[i][j] for i in range(len(members))
+                 for j in range(len(requests[i])) if results[i][j] == True]
+    print(len(withdrawn) == len(set(withdrawn)))
+    print(set(withdrawn) == {book_id for request in requests
+                             for book_id in request})
+    #The files read from scratch must agree: a book is on loan exactly
+    #when it has one log entry without a return date
+    cache.invalidate(db.database_file)
+    cache.invalidate(db.log_file)
+    open_loans = {}
+    for entry in db.return_log():
+        if entry[3] == "-":
+            open_loans[entry[0]] = open_loans.get(entry[0],0)+1
+    print(all((record[5] != "0") == (open_loans.get(record[0],0) == 1)
+              for record in db.return_database()))
+    print(db.record_returns(withdrawn))
+    #The database module uses its own copy of this module, so its
+    #measurements are the ones that have been recorded
+    print(db.logwriter.return_writer_stats())
+    for file_name in ["test_database.txt","test_logfile.txt",\
+                      "test_popularity.txt"]:
+        for test_file in [file_name,file_name+".lock"]:
+            if os.path.exists(test_file):
+                os.remove(test_file)
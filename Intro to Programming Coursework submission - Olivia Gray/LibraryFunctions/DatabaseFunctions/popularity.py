@@ -0,0 +1,283 @@
+"""
+NAME
+    popularity
+
+DESCRIPTION
+    Keeps a running count of how many times each book and each title has
+    been withdrawn, so the popularity of a book or a title can be looked
+    up without counting every entry in the log.
+    The counts are saved to a small file alongside the log, together with
+    how many log entries they cover. The counts for each title are saved
+    with a checksum of the title of every book, and are only added up
+    again from the counts for each book if a title has changed since. As the log is only ever added to,
+    only entries added since the file was saved need counting; the counts
+    are rebuilt from the whole log if the file is missing or covers more
+    entries than the log has.
+    Because of this the file does not need to be saved after every
+    checkout. It is only saved once save_interval entries have been
+    counted since it was last saved, and only while holding the lock on
+    the log, so two desks never write it at the same time.
+
+MODULE CONTENTS
+    return_book_key(book_id)
+    read_counts(file_name)
+    return_catalog_checksum(book_titles)
+    set_titles(records)
+    save_due()
+    write_counts(file_name)
+    build_counts(entries)
+    add_entries(entries)
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+import zlib
+import DatabaseFunctions.locking as locking
+
+#books maps a book ID (without leading zeros) to the number of log entries
+#for it and titles maps a lowercase title to the total for every book with
+#that title, while book_titles maps a book ID to its lowercase title.
+#entries is the number of log entries that have been counted, and saved
+#the number covered by the file when it was last read or written.
+#checksum is the checksum of book_titles the title counts were added up
+#for, or None if they have not been, and catalog_generation the generation
+#of the database book_titles was last checked against.
+counts = {"loaded":False,"entries":0,"saved":0,"books":{},"titles":{},\
+          "book_titles":{},"checksum":None,"catalog_generation":None}
+#How many entries are counted before the file is saved again.
+save_interval = 1000
+
+def return_book_key(book_id):
+    """
+    Returns the key a book's count is stored under, so that IDs written
+    with leading zeros are counted as the same book.
+
+    Parameters:
+    book_id (string): The ID of the book.
+
+    Returns:
+    (string): The book ID without leading zeros.
+    """
+    try:
+        return str(int(book_id))
+    except ValueError:
+        return book_id
+
+def read_counts(file_name):
+    """
+    Loads the counts for each book and title from the saved file. The
+    first line of the file holds the number of log entries counted and the
+    second the checksum of the titles the title counts were added up for.
+    Then come the number of books, a line for each with its ID and the
+    number of times it has been withdrawn, the number of titles, and a line
+    for each with the number of times it has been withdrawn and the title.
+
+    Parameters:
+    file_name (string): The file the counts were saved to.
+
+    Returns:
+    (bool): Whether the file could be read.
+    """
+    try:
+        count_file = open(file_name,"r")
+        lines = count_file.read().splitlines()
+        count_file.close()
+        entries = int(lines[0].split(", ")[1])
+        checksum = lines[1].split(", ")[1]
+        checksum = None if checksum == "-" else int(checksum)
+        book_lines = int(lines[2].split(", ")[1])
+        books = {}
+        for line in lines[3:3+book_lines]:
+            book_id,book_count = line.split(", ")
+            books[book_id] = int(book_count)
+        title_start = 4+book_lines
+        title_lines = int(lines[title_start-1].split(", ")[1])
+        titles = {}
+        for line in lines[title_start:title_start+title_lines]:
+            #Titles may contain ", " themselves, so only split once
+            title_count,title = line.split(", ",1)
+            titles[title] = int(title_count)
+    except:
+        return False
+    counts["books"] = books
+    counts["titles"] = titles
+    counts["checksum"] = checksum
+    #The titles of the books are checked the next time set_titles is called
+    counts["book_titles"] = {}
+    counts["catalog_generation"] = None
+    counts["entries"] = entries
+    counts["saved"] = entries
+    counts["loaded"] = True
+    return True
+
+def return_catalog_checksum(book_titles):
+    """
+    Returns a checksum of the title of every book, which changes if any
+    book is added, removed or given a different title.
+
+    Parameters:
+    book_titles (dict): Maps each book ID to its lowercase title.
+
+    Returns:
+    (int): The checksum.
+    """
+    text = "\n".join(book_id+", "+title for book_id,title
+                     in sorted(book_titles.items()))
+    return zlib.crc32(text.encode("utf-8"))
+
+def set_titles(records):
+    """
+    Updates the title of every book from the records of the database.
+    If any title has changed since the title counts were added up, they
+    are added up again from the counts for each book.
+
+    Parameters:
+    records (list): All records of the database.
+
+    Returns:
+    (bool): Whether the title counts were added up again.
+    """
+    book_titles = {}
+    for record in records:
+        #Index 2 within each record refers to the title field
+        book_titles[return_book_key(record[0])] = record[2].lower()
+    if book_titles == counts["book_titles"]:
+        return False
+    counts["book_titles"] = book_titles
+    checksum = return_catalog_checksum(book_titles)
+    if checksum == counts["checksum"]:
+        #The saved title counts were added up for these same titles
+        return False
+    titles = {}
+    for book_id,book_count in counts["books"].items():
+        title = book_titles.get(book_id)
+        if title != None:
+            titles[title] = titles.get(title,0)+book_count
+    counts["titles"] = titles
+    counts["checksum"] = checksum
+    return True
+
+def save_due():
+    """
+    Checks whether enough entries have been counted since the counts were
+    last saved for them to be saved again.
+
+    Returns:
+    (bool): Whether write_counts should be called.
+    """
+    return (counts["loaded"] == True
+            and abs(counts["entries"]-counts["saved"]) >= save_interval)
+
+def write_counts(file_name):
+    """
+    Saves the counts for each book and title, so they do not need to be
+    rebuilt the next time the program starts. This must only be called while
+    holding an exclusive lock on the log.
+
+    Parameters:
+    file_name (string): The file to save the counts to.
+
+    Returns:
+    void
+    """
+    checksum = "-" if counts["checksum"] == None else str(counts["checksum"])
+    lines = ["entries, "+str(counts["entries"]),"checksum, "+checksum,\
+             "books, "+str(len(counts["books"]))]
+    for book_id,book_count in counts["books"].items():
+        lines.append(book_id+", "+str(book_count))
+    lines.append("titles, "+str(len(counts["titles"])))
+    for title,title_count in counts["titles"].items():
+        lines.append(str(title_count)+", "+title)
+    try:
+        #Replaced all at once so other desks never read half of the file
+        locking.replace_file(file_name,"\n".join(lines))
+        counts["saved"] = counts["entries"]
+    except:
+        #The counts can always be rebuilt from the log
+        pass
+
+def build_counts(entries):
+    """
+    Counts every entry in the log from scratch.
+
+    Parameters:
+    entries (list): All entries in the log.
+
+    Returns:
+    void
+    """
+    counts["books"] = {}
+    counts["titles"] = {}
+    #The title counts are only complete if the books' titles are known
+    counts["checksum"] = None
+    if counts["book_titles"] != {}:
+        counts["checksum"] = return_catalog_checksum(counts["book_titles"])
+    counts["entries"] = 0
+    counts["saved"] = 0
+    counts["loaded"] = True
+    add_entries(entries)
+
+def add_entries(entries):
+    """
+    Adds new log entries to the counts for each book, and to the counts
+    for each title if the books' titles are known.
+
+    Parameters:
+    entries (list): The log entries added since the last were counted.
+
+    Returns:
+    void
+    """
+    books = counts["books"]
+    titles = counts["titles"]
+    book_titles = counts["book_titles"]
+    if book_titles == {} and len(entries) > 0:
+        #The title counts fall behind without the books' titles, so they
+        #are added up again when set_titles is next called
+        counts["checksum"] = None
+    for entry in entries:
+        #Entry[0] is the book ID
+        book_id = return_book_key(entry[0])
+        books[book_id] = books.get(book_id,0)+1
+        title = book_titles.get(book_id)
+        if title != None:
+            titles[title] = titles.get(title,0)+1
+    counts["entries"] += len(entries)
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.popularity
+    #database.txt and logfile.txt must be in the LibraryFunctions folder
+    #for tests to work.
+    import os
+    import DatabaseFunctions.cache as cache
+    records = cache.read_records("database.txt")
+    entries = cache.read_records("logfile.txt")
+    print(return_book_key("007"))
+    set_titles(records)
+    build_counts(entries)
+    print(counts["books"].get("1"))
+    print(counts["titles"].get("the lord of the rings"))
+    all_counts = dict(counts["books"])
+    all_titles = dict(counts["titles"])
+    #Counting the log in two parts must give the same counts
+    build_counts(entries[:len(entries)//2])
+    add_entries(entries[len(entries)//2:])
+    print(counts["books"] == all_counts and counts["entries"] == len(entries))
+    print(counts["titles"] == all_titles)
+    #The title counts must be the counts of their books added together
+    print(all(counts["titles"][title] == sum(counts["books"].get(book_id,0)
+              for book_id in counts["book_titles"]
+              if counts["book_titles"][book_id] == title)
+              for title in counts["titles"]))
+    print(save_due())
+    #Saved counts must be read back the same, and the title counts kept
+    #as the titles have not changed
+    write_counts("popularity_test.txt")
+    build_counts([])
+    print(read_counts("popularity_test.txt"))
+    print(set_titles(records))
+    print(counts["books"] == all_counts and counts["titles"] == all_titles)
+    os.remove("popularity_test.txt")
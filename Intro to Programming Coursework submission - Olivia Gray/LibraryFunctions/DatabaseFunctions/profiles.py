@@ -0,0 +1,141 @@
+"""
+NAME
+    profiles
+
+DESCRIPTION
+    Keeps a profile of the genres each member has borrowed, so their
+    favourite genre can be found without reading their whole history.
+    Each profile holds how many books of each genre the member has
+    withdrawn and when they last withdrew a book of that genre. The
+    favourite genre is the one withdrawn most often; if several genres
+    are tied, the one borrowed most recently is chosen, as it is likely
+    to be the member's current favourite.
+    The profiles are built from the log and then have new entries added
+    to them as books are checked out. They are only rebuilt if the genre
+    of a book in the database changes.
+
+MODULE CONTENTS
+    set_genres(records)
+    build_profiles(entries)
+    add_entries(entries)
+    return_favourite_genre(member_id)
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+import DatabaseFunctions.popularity as popularity
+
+#members maps a member ID to their profile, a dictionary holding the
+#number of books of each genre they have withdrawn ("counts") and the
+#position in the log of the last one they withdrew ("last").
+#book_genres maps a book ID (without leading zeros) to its genre, and
+#entries is the number of log entries that have been added.
+#catalog_generation is the generation of the database book_genres was
+#last checked against.
+profiles = {"entries":0,"members":{},"book_genres":{},\
+            "catalog_generation":None}
+
+def set_genres(records):
+    """
+    Updates the genre of every book from the records of the database.
+
+    Parameters:
+    records (list): All records of the database.
+
+    Returns:
+    (bool): Whether the genre of any book has changed, in which case
+    the profiles need to be built again.
+    """
+    book_genres = {}
+    for record in records:
+        #Index 1 within each record refers to the genre field
+        book_genres[popularity.return_book_key(record[0])] = record[1]
+    if book_genres == profiles["book_genres"]:
+        return False
+    profiles["book_genres"] = book_genres
+    return True
+
+def build_profiles(entries):
+    """
+    Builds the profile of every member from scratch.
+
+    Parameters:
+    entries (list): All entries in the log.
+
+    Returns:
+    void
+    """
+    profiles["members"] = {}
+    profiles["entries"] = 0
+    add_entries(entries)
+
+def add_entries(entries):
+    """
+    Adds new log entries to the profiles of the members who made them.
+    Entries for books that are not in the database are skipped.
+
+    Parameters:
+    entries (list): The log entries added since the last were added.
+
+    Returns:
+    void
+    """
+    members = profiles["members"]
+    book_genres = profiles["book_genres"]
+    position = profiles["entries"]
+    for entry in entries:
+        #Entry[0] is the book ID and entry[1] is the member ID
+        genre = book_genres.get(popularity.return_book_key(entry[0]))
+        if genre != None:
+            if entry[1] not in members:
+                members[entry[1]] = {"counts":{},"last":{}}
+            profile = members[entry[1]]
+            profile["counts"][genre] = profile["counts"].get(genre,0)+1
+            profile["last"][genre] = position
+        position += 1
+    profiles["entries"] = position
+
+def return_favourite_genre(member_id):
+    """
+    Returns the genre a member has withdrawn most often, choosing the
+    most recently borrowed genre if several are tied.
+
+    Parameters:
+    member_id (string): The ID of the member.
+
+    Returns:
+    favourite_genre (string): The member's favourite genre, or None if
+    they have never withdrawn a book.
+    """
+    profile = profiles["members"].get(member_id)
+    if profile == None:
+        return None
+    favourite_genre = None
+    for genre in profile["counts"]:
+        if (favourite_genre == None
+            or (profile["counts"][genre],profile["last"][genre])
+            > (profile["counts"][favourite_genre],
+               profile["last"][favourite_genre])):
+            favourite_genre = genre
+    return favourite_genre
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.profiles
+    #database.txt and logfile.txt must be in the LibraryFunctions folder for tests to work.
+    import DatabaseFunctions.cache as cache
+    records = cache.read_records("database.txt")
+    entries = cache.read_records("logfile.txt")
+    print(set_genres(records))
+    #Nothing has changed, so the profiles do not need building again
+    print(set_genres(records))
+    build_profiles(entries)
+    print(return_favourite_genre("coai"))
+    print(return_favourite_genre("test"))
+    all_members = profiles["members"]
+    #Adding the log in two parts must give the same profiles
+    build_profiles(entries[:len(entries)//2])
+    add_entries(entries[len(entries)//2:])
+    print(profiles["members"] == all_members)
@@ -0,0 +1,153 @@
+"""
+NAME
+    readbitmap
+
+DESCRIPTION
+    Records which books every member has read as a bitmap, using one bit
+    for each (member, book) pair.
+    Member IDs and book IDs are both numbered from 0 upwards. A book's
+    number is its position in the database, so the row of bits for a
+    member lines up with the records of the database, and each member's
+    number picks out their row. Bit i of a row is set if the member has
+    borrowed the book at position i.
+    The bitmap is built from the log, and new entries are added to it as
+    books are checked out. It is only rebuilt if the books in the database
+    have been reordered, added or removed.
+
+MODULE CONTENTS
+    set_books(records)
+    build_bitmap(entries)
+    add_entries(entries)
+    return_row(member_id)
+    has_read(member_id, book_id)
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+import DatabaseFunctions.popularity as popularity
+
+#book_codes maps a book ID (without leading zeros) to its position in the
+#database and member_codes maps a member ID to the number of their row in
+#rows. Each row is a bytearray of row_size bytes. entries is the number of
+#log entries that have been added, and catalog_generation the generation
+#of the database book_codes was last checked against.
+bitmap = {"entries":0,"book_codes":{},"member_codes":{},"rows":[],\
+          "row_size":0,"catalog_generation":None}
+
+def set_books(records):
+    """
+    Numbers every book by its position in the database.
+
+    Parameters:
+    records (list): All records of the database.
+
+    Returns:
+    (bool): Whether any book has a different number from before, in which
+    case the bitmap needs to be built again.
+    """
+    book_codes = {}
+    for position in range(len(records)):
+        book_codes[popularity.return_book_key(records[position][0])] = position
+    if book_codes == bitmap["book_codes"]:
+        return False
+    bitmap["book_codes"] = book_codes
+    #Eight books fit in each byte
+    bitmap["row_size"] = (len(records)+7)//8
+    return True
+
+def build_bitmap(entries):
+    """
+    Builds the bitmap from scratch from every entry in the log.
+
+    Parameters:
+    entries (list): All entries in the log.
+
+    Returns:
+    void
+    """
+    bitmap["member_codes"] = {}
+    bitmap["rows"] = []
+    bitmap["entries"] = 0
+    add_entries(entries)
+
+def add_entries(entries):
+    """
+    Sets the bit for the member and book of each new log entry. Entries
+    for books that are not in the database are skipped.
+
+    Parameters:
+    entries (list): The log entries added since the last were added.
+
+    Returns:
+    void
+    """
+    book_codes = bitmap["book_codes"]
+    member_codes = bitmap["member_codes"]
+    rows = bitmap["rows"]
+    for entry in entries:
+        #Entry[0] is the book ID and entry[1] is the member ID
+        position = book_codes.get(popularity.return_book_key(entry[0]))
+        if position == None:
+            continue
+        if entry[1] not in member_codes:
+            member_codes[entry[1]] = len(rows)
+            rows.append(bytearray(bitmap["row_size"]))
+        rows[member_codes[entry[1]]][position >> 3] |= 1 << (position & 7)
+    bitmap["entries"] += len(entries)
+
+def return_row(member_id):
+    """
+    Returns the row of the bitmap for a member. Bit i of the row, which is
+    bit i % 8 of byte i // 8, is set if they have read the book at
+    position i in the database.
+
+    Parameters:
+    member_id (string): The ID of the member.
+
+    Returns:
+    row (bytearray): The member's row, which must not be modified, or None
+    if they have never withdrawn a book.
+    """
+    code = bitmap["member_codes"].get(member_id)
+    if code == None:
+        return None
+    return bitmap["rows"][code]
+
+def has_read(member_id, book_id):
+    """
+    Checks whether a member has ever withdrawn a given book.
+
+    Parameters:
+    member_id (string): The ID of the member.
+    book_id (string): The ID of the book.
+
+    Returns:
+    (bool): Whether the member has withdrawn the book before.
+    """
+    row = return_row(member_id)
+    position = bitmap["book_codes"].get(popularity.return_book_key(book_id))
+    if row == None or position == None:
+        return False
+    return row[position >> 3] >> (position & 7) & 1 == 1
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.readbitmap
+    #database.txt and logfile.txt must be in the LibraryFunctions folder for tests to work.
+    import DatabaseFunctions.cache as cache
+    records = cache.read_records("database.txt")
+    entries = cache.read_records("logfile.txt")
+    print(set_books(records))
+    build_bitmap(entries)
+    print(has_read("coai","1"))
+    print(has_read("test","1"))
+    all_rows = [bytes(row) for row in bitmap["rows"]]
+    #Adding the log in two parts must give the same bitmap
+    build_bitmap(entries[:len(entries)//2])
+    add_entries(entries[len(entries)//2:])
+    print([bytes(row) for row in bitmap["rows"]] == all_rows)
+    #Every member must have read every book in the database they withdrew
+    print(all(has_read(entry[1],entry[0]) for entry in entries
+              if popularity.return_book_key(entry[0]) in bitmap["book_codes"]))
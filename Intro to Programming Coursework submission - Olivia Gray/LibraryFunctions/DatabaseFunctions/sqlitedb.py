@@ -0,0 +1,661 @@
+"""
+NAME
+    sqlitedb
+
+DESCRIPTION
+    An SQLite version of the functions in the database module, storing
+    the books and the log in a single local database file instead of
+    database.txt and logfile.txt.
+    Records and log entries are returned in the same format as the text
+    files would give, so the rest of the program does not need to know
+    which storage is being used.
+    The database module calls these functions when its backend is set
+    to "sqlite".
+    An SQLite connection can only be used by the thread that opened it,
+    so each thread that uses the database opens its own connection the
+    first time it needs one.
+
+MODULE CONTENTS
+    connect(file_name)
+    return_connection()
+    create_tables()
+    migrate(database_file, log_file)
+    return_generation()
+    return_database()
+    return_book_record(book_id)
+    return_availability(book_id)
+    update_availability(book_id, member_id)
+    update_availabilities(book_ids, member_id)
+    return_log()
+    return_log_length()
+    return_log_since(count)
+    return_log_by_book(book_id)
+    return_log_by_member(member_id)
+    has_member_read(member_id, book_id)
+    return_overdue(days)
+    return_overdue_days(days)
+    return_overdue_by_member(member_id, days)
+    add_log_entry(book_id, member_id)
+    add_log_entries(book_ids, member_id)
+    update_log(book_id)
+    update_logs(book_ids)
+    record_checkout(book_id, member_id)
+    record_checkouts(book_ids, member_id)
+    record_return(book_id)
+    record_returns(book_ids)
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+import sqlite3
+import threading
+import DatabaseFunctions.dates as dates
+import DatabaseFunctions.cache as cache
+
+#The database file in use, how many times connect has been called, how
+#many connections have been opened, a count of the changes this program has
+#committed, and the records and log last read along with the generation
+#they were read at.
+state = {"file_name":None,"opened":0,"connections":0,"changes":0,\
+         "generation":None,"records":None,"log":None}
+#The user_version stored in the database file once the text files have
+#been copied into it.
+migrated_version = 1
+#Holds each thread's own connection, the number of that connection and
+#the value of state["opened"] when it was opened.
+connections = threading.local()
+
+def connect(file_name):
+    """
+    Opens the SQLite database file, creating its tables if needed.
+
+    Parameters:
+    file_name (string): The SQLite database file to use.
+
+    Returns:
+    void
+    """
+    state["file_name"] = file_name
+    #Every thread opens a new connection to the new file when it next
+    #uses the database.
+    state["opened"] += 1
+    state["generation"] = None
+    create_tables()
+
+def return_connection():
+    """
+    Returns this thread's connection to the database file, opening it if
+    the thread has not used the database since connect was last called.
+
+    Returns:
+    connection (sqlite3.Connection): The thread's connection.
+    """
+    if getattr(connections,"opened",None) != state["opened"]:
+        if getattr(connections,"connection",None) != None:
+            connections.connection.close()
+        #Transactions are started explicitly so that checkouts and returns
+        #can take the write lock before reading anything.
+        connections.connection = sqlite3.connect(state["file_name"],\
+                                                 isolation_level=None)
+        connections.opened = state["opened"]
+        state["connections"] += 1
+        connections.number = state["connections"]
+    return connections.connection
+
+def create_tables():
+    """
+    Creates the books and loans tables and their indexes if they do not
+    already exist.
+
+    Returns:
+    void
+    """
+    connection = return_connection()
+    connection.executescript("""
+        CREATE TABLE IF NOT EXISTS books (
+            book_id INTEGER PRIMARY KEY,
+            genre TEXT NOT NULL,
+            title TEXT NOT NULL,
+            author TEXT NOT NULL,
+            purchase_date TEXT NOT NULL,
+            member_id TEXT NOT NULL DEFAULT '0');
+        CREATE INDEX IF NOT EXISTS books_member ON books(member_id);
+        CREATE INDEX IF NOT EXISTS books_title ON books(title COLLATE NOCASE);
+        CREATE TABLE IF NOT EXISTS loans (
+            loan_id INTEGER PRIMARY KEY,
+            book_id INTEGER NOT NULL,
+            member_id TEXT NOT NULL,
+            checkout_date TEXT NOT NULL,
+            checkout_day INTEGER NOT NULL,
+            return_date TEXT,
+            is_open INTEGER NOT NULL);
+        CREATE INDEX IF NOT EXISTS loans_book ON loans(book_id);
+        CREATE INDEX IF NOT EXISTS loans_member ON loans(member_id, book_id);
+        CREATE INDEX IF NOT EXISTS loans_open
+            ON loans(is_open, checkout_day);
+        CREATE INDEX IF NOT EXISTS loans_open_book ON loans(book_id)
+            WHERE is_open = 1;
+        """)
+
+def migrate(database_file, log_file):
+    """
+    Copies the books and log from the text files into the SQLite database.
+    This only happens once: the database's user_version is set to
+    migrated_version in the same transaction, and nothing is copied if it
+    is already set, even if the text files were empty or missing.
+
+    Parameters:
+    database_file (string): The text file holding the books.
+    log_file (string): The text file holding the log.
+
+    Returns:
+    void
+    """
+    connection = return_connection()
+    if connection.execute("PRAGMA user_version").fetchone()[0] \
+       >= migrated_version:
+        return
+    try:
+        records = cache.parse_file(database_file)[0]
+    except OSError:
+        records = []
+    try:
+        entries = cache.parse_file(log_file)[0]
+    except OSError:
+        entries = []
+    books = []
+    for record in records:
+        if len(record) == 6:
+            books.append((int(record[0]),record[1],record[2],\
+                          record[3],record[4],record[5]))
+    loans = []
+    for entry in entries:
+        if len(entry) == 4:
+            #A return date of "-" means the book is still on loan
+            is_open = 1 if entry[3] == "-" else 0
+            return_date = None if is_open == 1 else entry[3]
+            loans.append((int(entry[0]),entry[1],entry[2],\
+                          dates.parse_day(entry[2]),return_date,is_open))
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        #Checked again now the write lock is held, in case another desk
+        #has just migrated. Databases filled before user_version was used
+        #already hold the books, so they are only marked as migrated.
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        filled = connection.execute("SELECT COUNT(*) FROM books")\
+                 .fetchone()[0] > 0
+        if version < migrated_version and filled == False:
+            connection.executemany("INSERT INTO books VALUES \
+(?,?,?,?,?,?)",books)
+            connection.executemany("INSERT INTO loans (book_id, member_id, \
+checkout_date, checkout_day, return_date, is_open) VALUES (?,?,?,?,?,?)",loans)
+        connection.execute("PRAGMA user_version = "+str(migrated_version))
+        connection.execute("COMMIT")
+    except:
+        connection.execute("ROLLBACK")
+        raise
+    state["changes"] += 1
+
+def return_generation():
+    """
+    Returns a number that changes whenever the database is changed, either
+    by this program or by another connection.
+
+    Returns:
+    (tuple): The number of this thread's connection, SQLite's data version
+    for that connection, and this program's change count. Data versions of
+    different connections cannot be compared, so the generation changes
+    whenever a different thread reads the database.
+    """
+    connection = return_connection()
+    data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+    return (connections.number,data_version,state["changes"])
+
+def check_generation():
+    """
+    Throws away the cached records and log if the database has changed
+    since they were read.
+
+    Returns:
+    void
+    """
+    generation = return_generation()
+    if state["generation"] != generation:
+        state["generation"] = generation
+        state["records"] = None
+        state["log"] = None
+
+def book_row_to_record(row):
+    """
+    Converts a row of the books table into the format of a database.txt
+    record.
+
+    Parameters:
+    row (tuple): The row from the books table.
+
+    Returns:
+    (list): The record, with every field as a string.
+    """
+    return [str(row[0]),row[1],row[2],row[3],row[4],row[5]]
+
+def loan_row_to_entry(row):
+    """
+    Converts a row of the loans table into the format of a logfile.txt entry.
+
+    Parameters:
+    row (tuple): The book ID, member ID, checkout date and return date.
+
+    Returns:
+    (list): The log entry, with "-" as the return date if the book has
+    not been returned.
+    """
+    if row[3] == None:
+        return [str(row[0]),row[1],row[2],"-"]
+    return [str(row[0]),row[1],row[2],row[3]]
+
+loan_columns = "SELECT book_id, member_id, checkout_date, return_date \
+FROM loans"
+
+def return_database():
+    """
+    Returns a list of all books, in book ID order. The list is only read
+    again when the database changes, and must not be modified.
+
+    Returns:
+    records (list): The list of all records of books.
+    """
+    check_generation()
+    if state["records"] == None:
+        rows = return_connection().execute("SELECT * FROM books \
+ORDER BY book_id")
+        state["records"] = [book_row_to_record(row) for row in rows]
+    return state["records"]
+
+def return_book_record(book_id):
+    """
+    Returns the record of the book with the given ID.
+
+    Parameters:
+    book_id (string): The ID of the book to return.
+
+    Returns:
+    record (list): The book's record, or None if there is no such book.
+    """
+    try:
+        book_id = int(book_id)
+    except ValueError:
+        return None
+    row = return_connection().execute("SELECT * FROM books \
+WHERE book_id = ?",(book_id,)).fetchone()
+    if row == None:
+        return None
+    return book_row_to_record(row)
+
+def return_availability(book_id):
+    """
+    Returns the member_id field of the book with the given ID.
+
+    Parameters:
+    book_id (string): The book ID to check the availability of.
+
+    Returns:
+    availability (string): "0" if the book is available, otherwise the
+    ID of the member who has it.
+    """
+    return return_book_record(book_id)[5]
+
+def update_availability(book_id, member_id):
+    """
+    Changes the member_id field of the book with the given ID.
+
+    Parameters:
+    book_id (string): The ID of the book whose availability needs updating.
+    member_id (string): The ID of the member who has the book, or "0".
+
+    Returns:
+    void
+    """
+    update_availabilities([book_id],member_id)
+
+def update_availabilities(book_ids, member_id):
+    """
+    Changes the member_id field of several books at once.
+
+    Parameters:
+    book_ids (list): The IDs of the books whose availability needs updating.
+    member_id (string): The ID of the member who has the books, or "0".
+
+    Returns:
+    void
+    """
+    return_connection().executemany("UPDATE books SET member_id = ? \
+WHERE book_id = ?",[(member_id,int(book_id)) for book_id in book_ids])
+    state["changes"] += 1
+
+def return_log():
+    """
+    Returns a list of all entries in the log, in the order they were
+    added. The list is only read again when the database changes, and
+    must not be modified.
+
+    Returns:
+    records (list): List of all entries in the log.
+    """
+    check_generation()
+    if state["log"] == None:
+        rows = return_connection().execute(loan_columns+" ORDER BY loan_id")
+        state["log"] = [loan_row_to_entry(row) for row in rows]
+    return state["log"]
+
+def return_log_length():
+    """
+    Returns how many entries there are in the log.
+
+    Returns:
+    (int): The number of entries in the log.
+    """
+    return return_connection().execute("SELECT COUNT(*) FROM loans")\
+           .fetchone()[0]
+
+def return_log_since(count):
+    """
+    Returns the entries added to the log after the first given number.
+
+    Parameters:
+    count (int): How many entries to skip.
+
+    Returns:
+    entries (list): The later entries, in the order they were added.
+    """
+    rows = return_connection().execute(loan_columns+" ORDER BY loan_id \
+LIMIT -1 OFFSET ?",(count,))
+    return [loan_row_to_entry(row) for row in rows]
+
+def return_log_by_book(book_id):
+    """
+    Returns every log entry for a given book, in the order they were added.
+
+    Parameters:
+    book_id (string): The ID of the book.
+
+    Returns:
+    entries (list): List of all log entries for the book.
+    """
+    rows = return_connection().execute(loan_columns+" WHERE book_id = ? \
+ORDER BY loan_id",(int(book_id),))
+    return [loan_row_to_entry(row) for row in rows]
+
+def return_log_by_member(member_id):
+    """
+    Returns every log entry for a given member, in the order they were added.
+
+    Parameters:
+    member_id (string): The ID of the member.
+
+    Returns:
+    entries (list): List of all log entries for the member.
+    """
+    rows = return_connection().execute(loan_columns+" WHERE member_id = ? \
+ORDER BY loan_id",(member_id,))
+    return [loan_row_to_entry(row) for row in rows]
+
+def has_member_read(member_id, book_id):
+    """
+    Checks whether a member has ever withdrawn a given book.
+
+    Parameters:
+    member_id (string): The ID of the member.
+    book_id (string): The ID of the book.
+
+    Returns:
+    (bool): Whether the member has withdrawn the book before.
+    """
+    row = return_connection().execute("SELECT 1 FROM loans WHERE \
+member_id = ? AND book_id = ? LIMIT 1",(member_id,int(book_id))).fetchone()
+    return row != None
+
+def return_overdue(days):
+    """
+    Returns the log entries of every book that has been on loan for
+    more than the given number of days.
+
+    Parameters:
+    days (int): How many days a book can be on loan before it is overdue.
+
+    Returns:
+    overdue_books (list): List of the log entries of all overdue books.
+    """
+    rows = return_connection().execute(loan_columns+" WHERE is_open = 1 \
+AND checkout_day < ? ORDER BY loan_id",(dates.return_today()-days,))
+    return [loan_row_to_entry(row) for row in rows]
+
+def return_overdue_days(days):
+    """
+    Returns every book that has been on loan for more than the given
+    number of days, along with how many days past that it has been on loan.
+
+    Parameters:
+    days (int): How many days a book can be on loan before it is overdue.
+
+    Returns:
+    overdue_books (list): A (log entry, days overdue) tuple for each
+    overdue book.
+    """
+    cutoff_day = dates.return_today()-days
+    rows = return_connection().execute("SELECT book_id, member_id, \
+checkout_date, return_date, ? - checkout_day FROM loans WHERE is_open = 1 \
+AND checkout_day < ? ORDER BY loan_id",(cutoff_day,cutoff_day))
+    return [(loan_row_to_entry(row[:4]),row[4]) for row in rows]
+
+def return_overdue_by_member(member_id, days):
+    """
+    Returns the log entries of every book a given member has had on loan
+    for more than the given number of days.
+
+    Parameters:
+    member_id (string): The ID of the member.
+    days (int): How many days a book can be on loan before it is overdue.
+
+    Returns:
+    overdue_books (list): List of the log entries of the member's
+    overdue books.
+    """
+    rows = return_connection().execute(loan_columns+" WHERE member_id = ? \
+AND is_open = 1 AND checkout_day < ? ORDER BY loan_id",\
+                                       (member_id,dates.return_today()-days))
+    return [loan_row_to_entry(row) for row in rows]
+
+def add_log_entry(book_id, member_id):
+    """
+    Adds a new open loan to the log.
+
+    Parameters:
+    book_id (string): The ID of the book being withdrawn.
+    member_id (string): The ID of the member withdrawing the book.
+
+    Returns:
+    void
+    """
+    add_log_entries([book_id],member_id)
+
+def add_log_entries(book_ids, member_id):
+    """
+    Adds a new open loan to the log for each of several books withdrawn
+    by the same member.
+
+    Parameters:
+    book_ids (list): The IDs of the books being withdrawn.
+    member_id (string): The ID of the member withdrawing the books.
+
+    Returns:
+    void
+    """
+    checkout_day = dates.return_today()
+    checkout_date = dates.format_day(checkout_day)
+    loans = []
+    for book_id in book_ids:
+        loans.append((int(book_id),member_id,checkout_date,checkout_day))
+    return_connection().executemany("INSERT INTO loans (book_id, member_id, \
+checkout_date, checkout_day, return_date, is_open) VALUES (?,?,?,?,NULL,1)",\
+                                    loans)
+    state["changes"] += 1
+
+def update_log(book_id):
+    """
+    Adds today's date as the return date of a book's open loans.
+
+    Parameters:
+    book_id (string): The ID of the book being returned.
+
+    Returns:
+    void
+    """
+    update_logs([book_id])
+
+def update_logs(book_ids):
+    """
+    Adds today's date as the return date of the open loans of several books.
+
+    Parameters:
+    book_ids (list): The IDs of the books being returned.
+
+    Returns:
+    void
+    """
+    return_date = dates.format_day(dates.return_today())
+    return_connection().executemany("UPDATE loans SET return_date = ?, \
+is_open = 0 WHERE book_id = ? AND is_open = 1",\
+                                    [(return_date,int(book_id)) \
+                                     for book_id in book_ids])
+    state["changes"] += 1
+
+def record_checkout(book_id, member_id):
+    """
+    Checks out a book in a single transaction: the book is only marked as
+    withdrawn and the loan only added if the book is still available.
+
+    Parameters:
+    book_id (string): The ID of the book being withdrawn.
+    member_id (string): The ID of the member withdrawing the book.
+
+    Returns:
+    (bool): Whether the book was available and has been checked out.
+    """
+    return record_checkouts([book_id],member_id)[0]
+
+def record_checkouts(book_ids, member_id):
+    """
+    Checks out every available book in a list for the same member, in a
+    single transaction.
+
+    Parameters:
+    book_ids (list): The IDs of the books being withdrawn.
+    member_id (string): The ID of the member withdrawing the books.
+
+    Returns:
+    checked_out (list): A bool for each book ID, showing whether that book
+    was available and has been checked out.
+    """
+    connection = return_connection()
+    checked_out = []
+    withdrawn_ids = []
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        for book_id in book_ids:
+            #Only books that are still available are updated, so a book
+            #given twice is only checked out once.
+            updated = connection.execute("UPDATE books SET member_id = ? \
+WHERE book_id = ? AND member_id = '0'",(member_id,int(book_id))).rowcount
+            checked_out.append(updated == 1)
+            if updated == 1:
+                withdrawn_ids.append(book_id)
+        if withdrawn_ids != []:
+            add_log_entries(withdrawn_ids,member_id)
+        connection.execute("COMMIT")
+    except:
+        connection.execute("ROLLBACK")
+        raise
+    return checked_out
+
+def record_return(book_id):
+    """
+    Returns a book in a single transaction, closing its open loan and
+    making it available again.
+
+    Parameters:
+    book_id (string): The ID of the book being returned.
+
+    Returns:
+    (bool): Whether the book was on loan and has been returned.
+    """
+    return record_returns([book_id])[0]
+
+def record_returns(book_ids):
+    """
+    Returns every book in a list that is on loan, in a single transaction.
+
+    Parameters:
+    book_ids (list): The IDs of the books being returned.
+
+    Returns:
+    returned (list): A bool for each book ID, showing whether that book
+    was on loan and has been returned.
+    """
+    connection = return_connection()
+    returned = []
+    returned_ids = []
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        for book_id in book_ids:
+            updated = connection.execute("UPDATE books SET member_id = '0' \
+WHERE book_id = ? AND member_id != '0'",(int(book_id),)).rowcount
+            returned.append(updated == 1)
+            if updated == 1:
+                returned_ids.append(book_id)
+        if returned_ids != []:
+            update_logs(returned_ids)
+        connection.execute("COMMIT")
+    except:
+        connection.execute("ROLLBACK")
+        raise
+    return returned
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.sqlitedb
+    #database.txt and logfile.txt must be in the LibraryFunctions folder
+    #for tests to work. They are copied into a test database file, which
+    #is removed afterwards.
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+    test_file = "test_library.db"
+    connect(test_file)
+    migrate("database.txt","logfile.txt")
+    print(return_book_record("1"))
+    print(return_availability("1"))
+    print(return_log_by_member("coai"))
+    log_length = return_log_length()
+    print(log_length == len(cache.parse_file("logfile.txt")[0]))
+    #Connecting again must not copy the log a second time
+    connect(test_file)
+    migrate("database.txt","logfile.txt")
+    print(return_log_length() == log_length)
+    #Desks checking out the same books at the same time each use their
+    #own connection, and each book is only checked out once
+    available = [record[0] for record in return_database()
+                 if record[5] == "0"]
+    members = ["tst"+str(i) for i in range(4)]
+    with ThreadPoolExecutor(max_workers=len(members)) as pool:
+        results = list(pool.map(record_checkouts,[available]*len(members),\
+                                members))
+    print([sum(result[i] for result in results)
+           for i in range(len(available))] == [1]*len(available))
+    print(return_log_length() == log_length+len(available))
+    print(record_returns(available) == [True]*len(available))
+    print(return_overdue(60) == [entry for entry in return_log()
+          if entry[3] == "-"
+          and dates.return_today()-dates.parse_day(entry[2]) > 60])
+    return_connection().close()
+    os.remove(test_file)
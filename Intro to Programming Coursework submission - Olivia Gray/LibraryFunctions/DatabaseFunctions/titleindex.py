@@ -0,0 +1,235 @@
+"""
+NAME
+    titleindex
+
+DESCRIPTION
+    Builds and maintains an inverted index over the titles of every book,
+    so that searching for part of a title does not need to check every
+    record in the database.
+    Each lowercase title is split into trigrams (every run of three
+    characters) and the index maps each trigram to the books whose title
+    contains it. A search only has to check the books that contain every
+    trigram of the search term.
+    It also keeps every distinct title in alphabetical order, which works
+    as a compact prefix trie: the titles starting with a prefix are found
+    with a binary search and sit next to each other in the list.
+    The index is built when the database is first searched and, when the
+    database changes, only the titles that have changed are updated.
+
+MODULE CONTENTS
+    return_trigrams(text)
+    update_index(records, generation)
+    add_title(position, title)
+    remove_title(position)
+    find_titles(title)
+    has_title(title)
+    complete_title(prefix, limit)
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+from bisect import bisect_left, insort
+
+#titles holds the title of the record at each position in the database,
+#and lower_titles the same titles in lowercase. trigrams maps a trigram to
+#the set of positions whose title contains it, and exact_titles maps a
+#lowercase title to the number of books with exactly that title.
+#sorted_titles holds each distinct lowercase title in alphabetical order,
+#and display_titles maps it back to the title as it appears in the database.
+index = {"generation":None,"titles":[],"lower_titles":[],"trigrams":{},\
+         "exact_titles":{},"sorted_titles":[],"display_titles":{}}
+
+def return_trigrams(text):
+    """
+    Returns every run of three characters in a piece of text.
+
+    Parameters:
+    text (string): The text to split up.
+
+    Returns:
+    (set): The trigrams of the text.
+    """
+    return {text[i:i+3] for i in range(len(text)-2)}
+
+def update_index(records, generation):
+    """
+    Brings the index up to date with the records of the database. If the
+    records have changed since the index was last updated, only the
+    positions whose title has changed are re-indexed.
+
+    Parameters:
+    records (list): All records of the database.
+    generation: The generation of the database the records were read at.
+
+    Returns:
+    void
+    """
+    if index["generation"] == generation:
+        return
+    titles = index["titles"]
+    for position in range(len(records)):
+        #Index 2 within each record refers to the title field
+        title = records[position][2]
+        if position >= len(titles):
+            add_title(position, title)
+        elif titles[position] != title:
+            remove_title(position)
+            add_title(position, title)
+    #Remove any positions past the end of the database
+    while len(titles) > len(records):
+        remove_title(len(titles)-1)
+        titles.pop()
+        index["lower_titles"].pop()
+    index["generation"] = generation
+
+def add_title(position, title):
+    """
+    Adds the title of the record at a given position to the index.
+
+    Parameters:
+    position (int): The position of the record in the database.
+    title (string): The title of the record.
+
+    Returns:
+    void
+    """
+    lower_title = title.lower()
+    if position == len(index["titles"]):
+        index["titles"].append(title)
+        index["lower_titles"].append(lower_title)
+    else:
+        index["titles"][position] = title
+        index["lower_titles"][position] = lower_title
+    for trigram in return_trigrams(lower_title):
+        index["trigrams"].setdefault(trigram,set()).add(position)
+    exact_titles = index["exact_titles"]
+    if lower_title not in exact_titles:
+        exact_titles[lower_title] = 0
+        insort(index["sorted_titles"],lower_title)
+        index["display_titles"][lower_title] = title
+    exact_titles[lower_title] += 1
+
+def remove_title(position):
+    """
+    Removes the title of the record at a given position from the index.
+
+    Parameters:
+    position (int): The position of the record in the database.
+
+    Returns:
+    void
+    """
+    lower_title = index["lower_titles"][position]
+    for trigram in return_trigrams(lower_title):
+        positions = index["trigrams"][trigram]
+        positions.discard(position)
+        if len(positions) == 0:
+            del index["trigrams"][trigram]
+    exact_titles = index["exact_titles"]
+    exact_titles[lower_title] -= 1
+    if exact_titles[lower_title] == 0:
+        del exact_titles[lower_title]
+        sorted_titles = index["sorted_titles"]
+        del sorted_titles[bisect_left(sorted_titles,lower_title)]
+        del index["display_titles"][lower_title]
+
+def find_titles(title):
+    """
+    Returns the positions of every record whose title contains the given
+    text, ignoring capitalisation.
+
+    Parameters:
+    title (string): The text to search for.
+
+    Returns:
+    positions (list): The matching positions, in database order.
+    """
+    title = title.lower()
+    lower_titles = index["lower_titles"]
+    trigrams = return_trigrams(title)
+    if len(trigrams) == 0:
+        #Searches shorter than three characters cannot use the index
+        return [position for position in range(len(lower_titles))
+                if title in lower_titles[position]]
+    #Intersect the smallest sets first so there is less to check
+    posting_sets = []
+    for trigram in trigrams:
+        if trigram not in index["trigrams"]:
+            return []
+        posting_sets.append(index["trigrams"][trigram])
+    posting_sets.sort(key=len)
+    candidates = set(posting_sets[0])
+    for positions in posting_sets[1:]:
+        candidates &= positions
+        if len(candidates) == 0:
+            return []
+    #Sharing every trigram does not guarantee the text appears in order,
+    #so check each remaining title directly.
+    return sorted(position for position in candidates
+                  if title in lower_titles[position])
+
+def has_title(title):
+    """
+    Checks whether any book has exactly the given title,
+    ignoring capitalisation.
+
+    Parameters:
+    title (string): The title to look for.
+
+    Returns:
+    (bool): Whether a book with this title exists.
+    """
+    return title.lower() in index["exact_titles"]
+
+def complete_title(prefix, limit):
+    """
+    Returns the first titles in alphabetical order that start with the
+    given text, ignoring capitalisation. Each title is only given once,
+    however many copies of it the library owns.
+
+    Parameters:
+    prefix (string): The start of the title.
+    limit (int): The most titles to return.
+
+    Returns:
+    titles (list): The matching titles as they appear in the database.
+    """
+    prefix = prefix.lower()
+    sorted_titles = index["sorted_titles"]
+    titles = []
+    position = bisect_left(sorted_titles,prefix)
+    while (position < len(sorted_titles) and len(titles) < limit
+           and sorted_titles[position].startswith(prefix)):
+        titles.append(index["display_titles"][sorted_titles[position]])
+        position += 1
+    return titles
+
+if __name__ == "__main__":
+    #Run from the LibraryFunctions folder with
+    #python -m DatabaseFunctions.titleindex
+    #database.txt must be in the LibraryFunctions folder for tests to work.
+    import copy
+    import DatabaseFunctions.cache as cache
+    records = cache.read_records("database.txt")
+    update_index(records,1)
+    print(find_titles("the"))
+    print(has_title("the lord of the rings"))
+    print(complete_title("the",5))
+    #Searching with the index must give the same result as checking
+    #every title
+    print(find_titles("ring") == [position for position in
+          range(len(records)) if "ring" in records[position][2].lower()])
+    print(find_titles("xyzzy"))
+    #Updating the index after a title has changed and a book has been
+    #removed must give the same index as building it again
+    changed = [list(record) for record in records[:-1]]
+    changed[0][2] = "A Changed Title"
+    update_index(changed,2)
+    updated = copy.deepcopy(index)
+    index.update({"generation":None,"titles":[],"lower_titles":[],\
+                  "trigrams":{},"exact_titles":{},"sorted_titles":[],\
+                  "display_titles":{}})
+    update_index(changed,2)
+    print(updated == index)
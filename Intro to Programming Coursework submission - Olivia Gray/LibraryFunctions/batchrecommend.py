@@ -0,0 +1,182 @@
+"""
+NAME
+    batchrecommend
+
+DESCRIPTION
+    Works out the recommendations for every member who has borrowed from
+    the library at once, so "recommended for you" slips can be printed
+    overnight.
+    The database, log and member profiles are only read once. The members
+    are then split between a pool of worker processes, each of which is
+    given a read-only copy of the catalogue when it starts, and the top
+    recommendations for every member are written to a text file.
+    The recommendations are the same as bookrecommend gives using each
+    member's favourite genre.
+    To run it from the folder holding database.txt and logfile.txt:
+        python LibraryFunctions/batchrecommend.py slips.txt
+
+MODULE CONTENTS
+    load_catalogue(num_recommend, new_weight, genre_weight)
+    load_members(include_read)
+    start_worker(catalogue)
+    recommend_members(members)
+    write_recommendations(file_name, num_recommend, new_weight,
+                          genre_weight, include_read, workers)
+
+AUTHOR
+    Olivia Gray
+    18/10/2026
+"""
+
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+import bookrecommend as rec
+import DatabaseFunctions.database as db
+import DatabaseFunctions.dates as dates
+
+#The catalogue each worker process scores members against. It is set
+#once when the worker starts and is never changed.
+worker_catalogue = {}
+
+def load_catalogue(num_recommend, new_weight, genre_weight):
+    """
+    Reads everything needed to score a member that is the same for every
+    member: the popularity, ID, genre, purchase day and label of each book,
+    along with the settings to score them with.
+
+    Parameters:
+    num_recommend (int): The number of books to recommend to each member.
+    new_weight (int): The priority given to new books.
+    genre_weight (int): The priority given to books of the favourite genre.
+
+    Returns:
+    catalogue (dict): The catalogue, in database order.
+    """
+    database = db.return_database()
+    return {"popular_books":rec.return_popular_books(),\
+            "genres":[record[1].lower() for record in database],\
+            "purchase_days":list(db.return_purchase_days()),\
+            "labels":list(rec.return_labels()),\
+            "new_since":dates.return_today()-rec.new_book_days,\
+            "num_recommend":num_recommend,"new_weight":new_weight,\
+            "genre_weight":genre_weight}
+
+def load_members(include_read):
+    """
+    Reads the favourite genre of every member who has borrowed a book,
+    and their row of the has-read bitmap.
+
+    Parameters:
+    include_read (bool): Whether books the member has read should still
+    be recommended.
+
+    Returns:
+    members (list): A (member ID, favourite genre, row of books to leave
+    out) tuple for each member, in order of member ID.
+    """
+    member_ids = set()
+    for entry in db.return_log():
+        #Entry[1] is the member ID
+        member_ids.add(entry[1])
+    members = []
+    for member_id in sorted(member_ids):
+        if db.validate_member_id(member_id) == False:
+            continue
+        favourite_genre = db.return_favourite_genre(member_id)
+        #Books the member has read are only left out if they have a
+        #favourite genre, as in bookrecommend.
+        read_row = None
+        if include_read == False and favourite_genre != None:
+            read_row = db.return_read_row(member_id)
+        members.append((member_id,favourite_genre,read_row))
+    return members
+
+def start_worker(catalogue):
+    """
+    Gives a worker process its copy of the catalogue.
+
+    Parameters:
+    catalogue (dict): The catalogue from load_catalogue.
+
+    Returns:
+    void
+    """
+    worker_catalogue.update(catalogue)
+
+def recommend_members(members):
+    """
+    Works out the recommendations for a group of members using the
+    catalogue given to this worker.
+
+    Parameters:
+    members (list): The (member ID, favourite genre, row of books to leave
+    out) of each member, as returned by load_members.
+
+    Returns:
+    recommendations (list): A (member ID, scores, titles) tuple for each
+    member, with their recommendations in descending order of score.
+    """
+    catalogue = worker_catalogue
+    recommendations = []
+    for member_id,favourite_genre,read_row in members:
+        scores = rec.weight_scores(catalogue["popular_books"],\
+                                   catalogue["genres"],\
+                                   catalogue["purchase_days"],\
+                                   catalogue["new_since"],favourite_genre,\
+                                   read_row,catalogue["new_weight"],\
+                                   catalogue["genre_weight"])
+        scores,titles = rec.group_titles(scores,catalogue["labels"])
+        scores,titles = rec.return_top_titles(scores,titles,\
+                                              catalogue["num_recommend"])
+        recommendations.append((member_id,scores,titles))
+    return recommendations
+
+def write_recommendations(file_name, num_recommend=5, new_weight=2,
+                          genre_weight=6, include_read=False, workers=None):
+    """
+    Writes the top recommendations for every member who has borrowed a
+    book to a file, one line per recommendation in the form
+    "member ID, rank, score, title (genre)".
+
+    Parameters:
+    file_name (string): The file to write the recommendations to.
+    num_recommend (int): The number of books to recommend to each member.
+    new_weight (int): The priority given to new books.
+    genre_weight (int): The priority given to books of the favourite genre.
+    include_read (bool): Whether books the member has read should still
+    be recommended.
+    workers (int): How many worker processes to use. Defaults to the
+    number of processors.
+
+    Returns:
+    (int): The number of members recommendations were written for.
+    """
+    if workers == None:
+        workers = os.cpu_count() or 1
+    catalogue = load_catalogue(num_recommend,new_weight,genre_weight)
+    members = load_members(include_read)
+    #Give each worker several groups so they finish at about the same time
+    group_size = max(1,len(members)//(workers*4))
+    groups = [members[i:i+group_size] for i in range(0,len(members),\
+                                                     group_size)]
+    lines = []
+    with ProcessPoolExecutor(max_workers=workers,initializer=start_worker,\
+                             initargs=(catalogue,)) as pool:
+        for recommendations in pool.map(recommend_members,groups):
+            for member_id,scores,titles in recommendations:
+                for rank in range(len(titles)):
+                    #Labels are wrapped over several lines for the graph
+                    title = titles[rank].replace("\n"," ")
+                    lines.append(member_id+", "+str(rank+1)+", "\
+                                 +str(scores[rank])+", "+title)
+    output = open(file_name,"w")
+    output.write("\n".join(lines))
+    output.close()
+    return len(members)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python LibraryFunctions/batchrecommend.py output_file")
+    else:
+        print(write_recommendations(sys.argv[1]),"members written")
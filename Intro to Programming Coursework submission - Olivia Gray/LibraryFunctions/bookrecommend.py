@@ -1,288 +1,689 @@
-"""
-NAME
-    bookrecommend
-
-DESCRIPTION
-    Contains functions relating to producing a list of recommended
-    book titles for the user based on what is most popular and
-    what genre they take out most often.
-
-MODULE CONTENTS
-    return_popular_books()
-    return_member_genre(member_id)
-    is_book_new(purchase_date)
-    was_book_read(member_id,book_id)
-    sum_repeated_titles(popular_books,popular_titles)
-    return_recommendations(member_id)
-    return_genres()
-
-AUTHOR
-    Olivia Gray
-    27/11/2021
-
-"""
-
-import sys
-sys.path.append("DatabaseFunctions")
-
-from statistics import mode
-from datetime import date
-import textwrap as tw
-import DatabaseFunctions.database as db
-
-def return_popular_books():
-    """
-    Creates a list containing the amount of times each book has been withdrawn.
-
-    Returns:
-    withdrawn_amount (list): List representing the amount of times each book
-    has been withdrawn. The index+1 of the list represents the book ID.
-    """
-    #Order book IDs by popularity
-    log = db.return_log()
-    database = db.return_database()
-    #Book ID are basically indexes (starting at 1)
-    #so the index of the list can be used as a tag
-    #for which book ID we're looking at
-    withdrawn_amount = []
-    for record in database:
-        #Append 1 so that a book that has never been taken out before
-        #will still be affected by the weightings.
-        withdrawn_amount.append(1)
-    for entry in log:
-        withdrawn_amount[int(entry[0])-1] += 1
-
-    return withdrawn_amount
-
-def return_member_genre(member_id):
-    """
-    Finds which genre of book the user has taken out the most using the
-    log text document.
-
-    Parameters:
-    member_id (string): The ID of the member that the user wants to
-    create a recommendation list for.
-
-    Returns:
-    favourite_genre (string): The genre that the user has taken out most often.
-    """
-    log = db.return_log()
-    database = db.return_database()
-    withdrawn_books = []
-    withdrawn_genre = []
-
-    #Iterate through the log backwards
-    #This is so that if there are multiple genres taken out equally
-    #as much, it will return the most recent genre they took out as
-    #this is likely to be their current favourite genre.
-    for i in range(len(log)-1,-1,-1):
-        if log[i][1] == member_id:
-            withdrawn_books.append(log[i][0])
-
-    for book in withdrawn_books:
-        withdrawn_genre.append(database[int(book)-1][1])
-
-    #Find most commonly withdrawn genre
-    favourite_genre = mode(withdrawn_genre)
-
-    return favourite_genre
-
-def is_book_new(purchase_date):
-    """
-    Calculates if a book was purchased by the library in the last year.
-
-    Parameters:
-    purchase_date (string): purchase_date of the book ID to check if
-    it is new or not.
-
-    Returns:
-    (bool): Signifies if a book is newly purchased or not.
-    """
-    purchase_date = purchase_date.split("/")
-    days_since_purchase = (date.today() - date(int(purchase_date[2]),\
-                                               int(purchase_date[1]),\
-                                               int(purchase_date[0]))).days 
-    if days_since_purchase<= 100 :
-        return True
-    return False
-
-def was_book_read(member_id,book_id):
-    """
-    Scans the log file to check if a given member has previously
-    read a given book.
-
-    Parameters:
-    member_id (string): ID of member to check if they have already read
-    a book.
-    book_id (int): ID of book we are checking if a member has already read.
-    """
-    log=db.return_log()
-    for entry in log:
-        if entry[1]==member_id and entry[0]==str(book_id):
-            #This means they have already withdrawn the book before.
-            return True
-    return False
-
-def sum_repeated_titles(popular_books,popular_titles):
-    """
-    Takes the list of popular titles and removes any repeated titles,
-    adding their score to the score in the first occurence of the title
-    in the list of popular books.
-
-    Parameters:
-    popular_books (list): List of the amount of times a book has been taken out.
-    popular_titles (list): List of the titles of each book in popular_books,
-    in the same order.
-
-    Returns:
-    popular_books (list): List of all books with repeated books added together.
-    popular_titles (list): List of all book titles, with repeated occurences
-    removed.
-    """
-    for i in range(len(popular_books)):
-        #If the first occurence of the current title is not the current
-        #index it has already occured before so we can add the value to the
-        #first occurence and remove the current occurence.
-        index = popular_titles.index(popular_titles[i])
-        if index != i:
-            popular_books[index] += popular_books[i]
-            #Give the lists an arbitrary null value to remove at the end 
-            popular_books[i] = "///"
-            popular_titles[i] = "///"
-
-    while "///" in popular_books:
-        popular_books.remove("///")
-        popular_titles.remove("///")
-    return popular_books,popular_titles
-
-def return_recommendations(member_id,num_recommend,new_weight,
-                           genre_weight,genre,include_read):
-    """
-    Collects the information about the most popular books and the member's
-    favourite genre and sorts it into a list of 5 recommendations for the
-    member.
-
-    Parameters:
-    member_id (string): The ID of the member to create a recommendation
-    list for.
-    num_recommend (int): The number of books should be recommended by the
-    function.
-    new_weight (int): The priority given to new books in the algorithm
-    (higher is better).
-    genre_weight (int): The priority given to books belonging to the
-    member's favourite genre (higher is better).
-    include_read (bool): Whether the algorithm should omit books the
-    member has already read.
-
-    Returns:
-    recommended_books (list): List of popularity rankings (descending).
-    recommended_titles (list): List containing the corresponding book titles
-    to the values in recommended_books.
-    """
-    if db.validate_member_id(member_id) == True:
-        database = db.return_database()
-        popular_books = return_popular_books()
-        
-        try:
-            if genre != "DEFAULT":
-                favourite_genre = genre
-            else:
-                favourite_genre = return_member_genre(member_id)
-        except:
-            #If return_member_genre errors, it is because the member has not
-            #rented from the library before so the system has no data on them.
-            #In this case, recommend them the most popular books.
-            popular_titles = []
-            for record in database:
-                #Fill is used to wrap text to the next line.
-                #This stops titles overlapping on the graph.
-                popular_titles.append(tw.fill(record[2],width=20)\
-                                      +"\n("+record[1]+")")
-            #Apply a higher weighting to new books
-            for i in range(len(popular_books)):
-                if is_book_new(database[i][4]) == True:
-                    #Add 1 so that new books will be recommended even if they
-                    #have not yet been taken out.
-                    popular_books[i] *= new_weight
-            #Remove duplicate titles.
-            popular_books,popular_titles=sum_repeated_titles\
-                                          (popular_books,popular_titles)
-            #Sort both popular books and popular titles in descending order
-            #according to popular books.   
-            popular_books,popular_titles = (list(i) for i in zip\
-                    (*sorted(zip(popular_books,popular_titles),reverse=True)))
-            #Only return the top 5 recommendations.
-            recommended_books = popular_books[:num_recommend]
-            recommended_titles = popular_titles[:num_recommend]
-            return recommended_books,recommended_titles    
-
-        #Apply a higher weighting to books in popular_books
-        #that are the member's preferred genre and new books.
-        #Decrease the weighting if the member has already read the book.
-        for i in range(len(popular_books)):
-            is_new = is_book_new(database[i][4])
-            if (was_book_read(member_id,database[i][0]) == True
-                and include_read == False):
-                popular_books[i] *= 0
-            elif (database[i][1].lower() == favourite_genre.lower()
-                  and is_new == True):
-                popular_books[i] *= (genre_weight+new_weight)
-            elif database[i][1].lower() == favourite_genre.lower():
-                popular_books[i] *= genre_weight
-            elif is_new == True:
-                popular_books[i] *= new_weight
-            else:
-                popular_books[i] *= 1
-
-        #Now need to add together scores of books with same title (different ID)
-        popular_titles = []
-        for i in range(len(popular_books)):
-            popular_titles.append(tw.fill(database[i][2],width=20)\
-                                  +"\n("+database[i][1]+")")
-
-        popular_books,popular_titles = sum_repeated_titles\
-                                       (popular_books,popular_titles)    
-        
-        #Sort popular_books now into descending order (most popular at start)
-        #This sorts both books and titles into descending order, keeping
-        #titles in the order representing books
-        popular_books,popular_titles = (list(i) for i in zip\
-                (*sorted(zip(popular_books,popular_titles),reverse=True)))
-
-        recommended_books = popular_books[:num_recommend]
-        recommended_titles = popular_titles[:num_recommend]
-
-        return recommended_books,recommended_titles
-
-def return_genres():
-    """
-    Creates a list of every genre the library owns.
-
-    Returns:
-    genres (list): Contains each genre that the library owns a book of.
-    
-    """
-    genres=[]
-    for record in db.return_database():
-        if record[1] not in genres:
-            genres.append(record[1])
-    return genres
-
-if __name__ == "__main__":
-    #Database.txt and logfile.txt must be in LibraryFunctions folder for tests
-    #to work correctly
-    print(return_popular_books())
-    print(return_member_genre("coai"))
-    print(return_recommendations("coai",5,2,6))
-    print(return_recommendations("qwer",5,7,2))
-    print(is_book_new("13/1/2020"))
-    print(is_book_new("13/1/2021"))
-    print(is_book_new("24/11/2000"))
-    print(was_book_read("coai",12))
-    print(was_book_read("coai",21))
-    print(return_genres())
-            
-
-
-
-
+"""
+NAME
+    bookrecommend
+
+DESCRIPTION
+    Contains functions relating to producing a list of recommended
+    book titles for the user based on what is most popular and
+    what genre they take out most often.
+    A second recommender, return_coborrowed_books, instead suggests the
+    books most often borrowed by members who borrowed the same books as
+    the given member.
+    If NumPy is installed, every book is scored at once using arrays
+    that are only rebuilt when the database changes, copies of the same
+    title are added together with bincount and only the few titles that
+    could be in the top recommendations are sorted. The popularity of each
+    book is kept as an array too, and new log entries are added to it.
+    Otherwise the books are scored one at a time, which gives the same
+    result. NumPy is only loaded the first time books are scored, so it
+    does not slow down starting the menu.
+    Recent recommendations are kept for a few minutes, so asking for the
+    same member's recommendations again does not work them out from
+    scratch unless the member has checked out or returned a book, or
+    the database has changed.
+
+MODULE CONTENTS
+    return_popular_books()
+    return_member_genre(member_id)
+    is_book_new(purchase_date)
+    was_book_read(member_id,book_id)
+    sum_repeated_titles(popular_books,popular_titles)
+    return_labels()
+    group_titles(popular_books,popular_titles)
+    return_top_titles(popular_books,popular_titles,num_recommend)
+    load_numpy()
+    return_catalog_arrays()
+    return_popular_array()
+    return_top_array(totals,labels,num_recommend)
+    rank_titles(member_id,favourite_genre,new_weight,genre_weight,
+                include_read,num_recommend)
+    return_scores(member_id,popular_books,favourite_genre,new_weight,
+                  genre_weight,include_read)
+    weight_scores(popular_books,genres,purchase_days,new_since,
+                  favourite_genre,read_row,new_weight,genre_weight)
+    return_recommendations(member_id,num_recommend,new_weight,
+                           genre_weight,genre,include_read)
+    calculate_recommendations(member_id,num_recommend,new_weight,
+                              genre_weight,genre,include_read)
+    clear_recommendations()
+    return_book_labels()
+    return_coborrowed_books(member_id,num_recommend)
+    return_genres()
+
+AUTHOR
+    Olivia Gray
+    27/11/2021
+
+"""
+
+import sys
+sys.path.append("DatabaseFunctions")
+
+from heapq import nlargest
+from collections import OrderedDict
+import time
+from datetime import date
+import textwrap as tw
+import DatabaseFunctions.database as db
+import DatabaseFunctions.dates as dates
+import DatabaseFunctions.popularity as popularity
+import DatabaseFunctions.coborrow as coborrow
+
+#NumPy, once load_numpy has loaded it, or None if it is not installed or
+#has not been loaded yet.
+np = None
+numpy_state = {"tried":False}
+
+#How many days after being purchased a book still counts as new.
+new_book_days = 100
+#The graph label of every book, in database order, and the label of each
+#book ID (without leading zeros). These are rebuilt whenever the database
+#changes.
+catalog_labels = {"generation":None,"labels":[],"book_labels":{}}
+#The lowercase genre and purchase day of every book as NumPy arrays,
+#in database order, the number of each book's title among the distinct
+#titles (title_codes), the label of each distinct title (group_labels) and
+#the positions of the books with each ID, without leading zeros
+#(book_positions). These are also rebuilt whenever the database changes.
+catalog_arrays = {"generation":None,"genres":None,"purchase_days":None,\
+                  "title_codes":None,"group_labels":None,\
+                  "book_positions":{}}
+#The popularity of every book as a NumPy array, in the same order as
+#return_popular_books, with the generation of the database and number of
+#log entries it covers.
+popularity_array = {"generation":None,"entries":None,"counts":None}
+#Every genre the library owns, in the order they first appear in the
+#database. This is also rebuilt whenever the database changes.
+catalog_genres = {"generation":None,"genres":[]}
+#Recent recommendations, keyed by the arguments they were made with, from
+#least to most recently used. Each holds the time it was made, the
+#generation of the database and the member's version at that time, and
+#the recommendations themselves.
+recommendation_cache = OrderedDict()
+#The most recommendations kept, and how many seconds each is kept for.
+recommendation_cache_size = 64
+recommendation_lifetime = 300
+
+def return_popular_books():
+    """
+    Creates a list containing the amount of times each book has been withdrawn.
+
+    Returns:
+    withdrawn_amount (list): List representing the amount of times each book
+    has been withdrawn, in database order.
+    """
+    #The database keeps a running count of how many times each book has
+    #been withdrawn, so the log does not need to be read.
+    book_counts = db.return_popularity()["books"]
+    withdrawn_amount = []
+    for record in db.return_database():
+        #The counts are looked up by each book's own ID, so they stay
+        #right if the books are not in ID order or some IDs are missing.
+        #Add 1 so that a book that has never been taken out before
+        #will still be affected by the weightings.
+        withdrawn_amount.append(book_counts.get(\
+            popularity.return_book_key(record[0]),0)+1)
+
+    return withdrawn_amount
+
+def return_member_genre(member_id):
+    """
+    Finds which genre of book the user has taken out the most using the
+    log text document.
+
+    Parameters:
+    member_id (string): The ID of the member that the user wants to
+    create a recommendation list for.
+
+    Returns:
+    favourite_genre (string): The genre that the user has taken out most often,
+    or None if they have not taken out any books.
+    """
+    #The database keeps a profile of the genres each member has borrowed,
+    #so their history does not need to be read again.
+    #If there are multiple genres taken out equally as much, it will
+    #return the most recent genre they took out as this is likely
+    #to be their current favourite genre.
+    return db.return_favourite_genre(member_id)
+
+def is_book_new(purchase_date):
+    """
+    Calculates if a book was purchased by the library in the last year.
+
+    Parameters:
+    purchase_date (string): purchase_date of the book ID to check if
+    it is new or not.
+
+    Returns:
+    (bool): Signifies if a book is newly purchased or not.
+    """
+    purchase_date = purchase_date.split("/")
+    days_since_purchase = (date.today() - date(int(purchase_date[2]),\
+                                               int(purchase_date[1]),\
+                                               int(purchase_date[0]))).days 
+    if days_since_purchase<= new_book_days :
+        return True
+    return False
+
+def was_book_read(member_id,book_id):
+    """
+    Checks the log to see if a given member has previously
+    read a given book.
+
+    Parameters:
+    member_id (string): ID of member to check if they have already read
+    a book.
+    book_id (int): ID of book we are checking if a member has already read.
+    """
+    #Uses the log index rather than scanning every entry in the log.
+    return db.has_member_read(member_id,book_id)
+
+def sum_repeated_titles(popular_books,popular_titles):
+    """
+    Takes the list of popular titles and removes any repeated titles,
+    adding their score to the score in the first occurence of the title
+    in the list of popular books.
+
+    Parameters:
+    popular_books (list): List of the amount of times a book has been taken out.
+    popular_titles (list): List of the titles of each book in popular_books,
+    in the same order.
+
+    Returns:
+    popular_books (list): List of all books with repeated books added together.
+    popular_titles (list): List of all book titles, with repeated occurences
+    removed.
+    """
+    for i in range(len(popular_books)):
+        #If the first occurence of the current title is not the current
+        #index it has already occured before so we can add the value to the
+        #first occurence and remove the current occurence.
+        index = popular_titles.index(popular_titles[i])
+        if index != i:
+            popular_books[index] += popular_books[i]
+            #Give the lists an arbitrary null value to remove at the end 
+            popular_books[i] = "///"
+            popular_titles[i] = "///"
+
+    while "///" in popular_books:
+        popular_books.remove("///")
+        popular_titles.remove("///")
+    return popular_books,popular_titles
+
+def return_labels():
+    """
+    Returns the label shown on the graph for every book: its title wrapped
+    over several lines followed by its genre. Books with the same label are
+    treated as copies of the same title. The labels are only made again
+    when the database has changed.
+
+    Returns:
+    labels (list): The label of each book, in database order.
+    """
+    generation = db.return_catalog_generation()
+    if catalog_labels["generation"] != generation:
+        labels = []
+        book_labels = {}
+        for record in db.return_database():
+            #Fill is used to wrap text to the next line.
+            #This stops titles overlapping on the graph.
+            labels.append(tw.fill(record[2],width=20)+"\n("+record[1]+")")
+            book_labels[popularity.return_book_key(record[0])] = labels[-1]
+        catalog_labels["labels"] = labels
+        catalog_labels["book_labels"] = book_labels
+        catalog_labels["generation"] = generation
+    return catalog_labels["labels"]
+
+def return_book_labels():
+    """
+    Returns the label shown on the graph for each book ID.
+
+    Returns:
+    book_labels (dict): Maps each book ID, without leading zeros,
+    to its label.
+    """
+    return_labels()
+    return catalog_labels["book_labels"]
+
+def group_titles(popular_books,popular_titles):
+    """
+    Adds together the scores of every copy of the same title, keeping each
+    title where it first occurs. This gives the same result as
+    sum_repeated_titles but uses a dictionary keyed by title, so each book
+    is only looked at once and the given lists are not changed.
+
+    Parameters:
+    popular_books (list): The score of each book.
+    popular_titles (list): The title of each book in popular_books,
+    in the same order.
+
+    Returns:
+    popular_books (list): The total score of each distinct title.
+    popular_titles (list): Each distinct title, in order of first occurence.
+    """
+    #Dictionaries remember the order keys were first added in
+    totals = {}
+    for i in range(len(popular_books)):
+        title = popular_titles[i]
+        if title in totals:
+            totals[title] += popular_books[i]
+        else:
+            totals[title] = popular_books[i]
+    return list(totals.values()),list(totals.keys())
+
+def return_top_titles(popular_books,popular_titles,num_recommend):
+    """
+    Picks out the highest scoring titles, in descending order of score.
+    Titles with the same score are ordered as sorting the whole list in
+    reverse would order them.
+
+    Parameters:
+    popular_books (list): The score of each title.
+    popular_titles (list): The titles, in the same order as popular_books.
+    num_recommend (int): How many titles to return.
+
+    Returns:
+    recommended_books (list): The scores of the chosen titles.
+    recommended_titles (list): The chosen titles.
+    """
+    top = nlargest(num_recommend,zip(popular_books,popular_titles))
+    recommended_books = [score for score,title in top]
+    recommended_titles = [title for score,title in top]
+    return recommended_books,recommended_titles
+
+def load_numpy():
+    """
+    Loads NumPy the first time it is needed, as it takes a while to load.
+    Only tries once, so if NumPy is not installed the books are scored
+    one at a time from then on.
+
+    Returns:
+    np (module): NumPy, or None if it is not installed.
+    """
+    global np
+    if numpy_state["tried"] == False:
+        numpy_state["tried"] = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+def return_catalog_arrays():
+    """
+    Returns the lowercase genre and purchase day of every book as
+    NumPy arrays, only building them again when the database has changed.
+    Must only be called once NumPy is loaded.
+
+    Returns:
+    catalog_arrays (dict): The arrays, in the same order as the database.
+    """
+    generation = db.return_catalog_generation()
+    if catalog_arrays["generation"] != generation:
+        database = db.return_database()
+        catalog_arrays["genres"] = np.array([record[1].lower() for record\
+                                             in database],dtype=str)
+        catalog_arrays["purchase_days"] = np.array(db.return_purchase_days(),\
+                                                   dtype=np.int64)
+        #Number the distinct labels in order of first occurence
+        codes = {}
+        labels = return_labels()
+        catalog_arrays["title_codes"] = np.fromiter((codes.setdefault(label,\
+                    len(codes)) for label in labels),dtype=np.intp,\
+                    count=len(labels))
+        catalog_arrays["group_labels"] = list(codes)
+        book_positions = {}
+        records = db.return_database()
+        for position in range(len(records)):
+            book_positions.setdefault(popularity.return_book_key(\
+                records[position][0]),[]).append(position)
+        catalog_arrays["book_positions"] = book_positions
+        catalog_arrays["generation"] = generation
+    return catalog_arrays
+
+def return_popular_array():
+    """
+    Returns the same popularity as return_popular_books as a NumPy array.
+    Only the log entries added since it was last made are added to it,
+    unless the database has changed. Must only be called once NumPy is
+    loaded.
+
+    Returns:
+    counts (numpy.ndarray): The popularity of each book, which must not
+    be modified.
+    """
+    entries = db.return_popularity()["entries"]
+    generation = db.return_catalog_generation()
+    counts = popularity_array["counts"]
+    if (popularity_array["generation"] != generation
+        or popularity_array["entries"] == None
+        or popularity_array["entries"] > entries):
+        counts = np.array(return_popular_books(),dtype=np.int64)
+    elif popularity_array["entries"] < entries:
+        counts = counts.copy()
+        book_positions = return_catalog_arrays()["book_positions"]
+        for entry in db.return_log_since(popularity_array["entries"]):
+            #Entry[0] is the book ID
+            for position in book_positions.get(\
+                    popularity.return_book_key(entry[0]),[]):
+                counts[position] += 1
+    popularity_array["counts"] = counts
+    popularity_array["generation"] = generation
+    popularity_array["entries"] = entries
+    return counts
+
+def return_top_array(totals,labels,num_recommend):
+    """
+    Picks out the highest scoring titles from a NumPy array of scores,
+    giving the same result as return_top_titles. Only the titles scoring
+    at least as much as the num_recommend-th best are sorted.
+
+    Parameters:
+    totals (numpy.ndarray): The score of each title.
+    labels (list): The titles, in the same order as totals.
+    num_recommend (int): How many titles to return.
+
+    Returns:
+    recommended_books (list): The scores of the chosen titles.
+    recommended_titles (list): The chosen titles.
+    """
+    candidates = np.arange(len(totals))
+    if 0 < num_recommend < len(totals):
+        threshold = totals[np.argpartition(totals,-num_recommend)\
+                           [-num_recommend]]
+        #Titles with the same score as the last one picked are kept, so
+        #ties are broken by title as return_top_titles breaks them.
+        candidates = np.flatnonzero(totals >= threshold)
+    return return_top_titles(totals[candidates].tolist(),\
+                             [labels[i] for i in candidates],num_recommend)
+
+def rank_titles(member_id,favourite_genre,new_weight,genre_weight,
+                include_read,num_recommend):
+    """
+    Scores every book, adds together the scores of copies of the same
+    title and picks out the highest scoring titles.
+
+    Parameters:
+    member_id (string): The ID of the member the books are being scored for.
+    favourite_genre (string): The member's favourite genre, or None if
+    genre should not affect the scores.
+    new_weight (int): The priority given to new books.
+    genre_weight (int): The priority given to books of the favourite genre.
+    include_read (bool): Whether books the member has read keep their score.
+    num_recommend (int): How many titles to return.
+
+    Returns:
+    recommended_books (list): The scores of the chosen titles.
+    recommended_titles (list): The chosen titles.
+    """
+    if load_numpy() != None:
+        popular_books = return_popular_array()
+        scores = return_scores(member_id,popular_books,favourite_genre,\
+                               new_weight,genre_weight,include_read)
+        arrays = return_catalog_arrays()
+        #bincount adds up the scores as floats, which hold whole numbers
+        #of this size exactly, so they are turned back into integers.
+        totals = np.bincount(arrays["title_codes"],weights=scores,\
+                             minlength=len(arrays["group_labels"]))\
+                             .astype(np.int64)
+        return return_top_array(totals,arrays["group_labels"],num_recommend)
+    popular_books = return_popular_books()
+    scores = return_scores(member_id,popular_books,favourite_genre,\
+                           new_weight,genre_weight,include_read)
+    #Now need to add together scores of books with same title (different ID)
+    scores,titles = group_titles(scores,return_labels())
+    #Only the most popular titles are needed, so they are picked out
+    #without sorting every title.
+    return return_top_titles(scores,titles,num_recommend)
+
+def return_scores(member_id,popular_books,favourite_genre,new_weight,
+                  genre_weight,include_read):
+    """
+    Weights the popularity of every book by whether it is new, whether it
+    belongs to the member's favourite genre and whether they have read it.
+
+    Parameters:
+    member_id (string): The ID of the member the books are being scored for.
+    popular_books (list): The popularity of each book, in database order,
+    as a NumPy array if NumPy is installed.
+    favourite_genre (string): The member's favourite genre, or None if
+    genre should not affect the scores.
+    new_weight (int): The priority given to new books.
+    genre_weight (int): The priority given to books of the favourite genre.
+    include_read (bool): Whether books the member has read keep their score.
+
+    Returns:
+    scores (list): The weighted score of each book, in database order,
+    as a NumPy array if NumPy is installed.
+    """
+    #Purchase dates are converted to day numbers once by the database,
+    #so checking whether a book is new is a single comparison.
+    new_since = dates.return_today()-new_book_days
+    if load_numpy() != None:
+        arrays = return_catalog_arrays()
+        is_new = arrays["purchase_days"] >= new_since
+        if favourite_genre == None:
+            is_genre = np.zeros(len(popular_books),dtype=bool)
+        else:
+            is_genre = arrays["genres"] == favourite_genre.lower()
+        #The first condition that is true picks the weight of each book
+        weights = np.select([is_genre & is_new,is_genre,is_new],\
+                            [genre_weight+new_weight,genre_weight,new_weight],1)
+        read_row = db.return_read_row(member_id)
+        if include_read == False and read_row != None:
+            #Unpack the member's row of the has-read bitmap into one
+            #True or False for each book
+            is_read = np.unpackbits(np.frombuffer(read_row,dtype=np.uint8),\
+                                    bitorder="little")[:len(weights)]
+            weights[is_read.astype(bool)] = 0
+        return popular_books*weights
+
+    database = db.return_database()
+    read_row = None
+    if include_read == False:
+        read_row = db.return_read_row(member_id)
+    return weight_scores(popular_books,\
+                         [record[1].lower() for record in database],\
+                         db.return_purchase_days(),new_since,\
+                         favourite_genre,read_row,new_weight,genre_weight)
+
+def weight_scores(popular_books,genres,purchase_days,new_since,
+                  favourite_genre,read_row,new_weight,genre_weight):
+    """
+    Weights the popularity of every book one at a time, without using
+    NumPy or reading the database, so it can also be used by worker
+    processes that have been given a copy of the catalogue.
+
+    Parameters:
+    popular_books (list): The popularity of each book.
+    genres (list): The lowercase genre of each book.
+    purchase_days (list): The day number each book was purchased on.
+    new_since (int): Books purchased on or after this day are new.
+    favourite_genre (string): The member's favourite genre, or None if
+    genre should not affect the scores.
+    read_row (bytearray): The member's row of the has-read bitmap, with
+    bit i set if the book at position i should be given a score of 0, or
+    None if no books should be.
+    new_weight (int): The priority given to new books.
+    genre_weight (int): The priority given to books of the favourite genre.
+
+    Returns:
+    scores (list): The weighted score of each book.
+    """
+    if favourite_genre != None:
+        favourite_genre = favourite_genre.lower()
+    scores = list(popular_books)
+    for i in range(len(scores)):
+        is_new = purchase_days[i] >= new_since
+        is_genre = genres[i] == favourite_genre
+        if read_row != None and read_row[i >> 3] >> (i & 7) & 1 == 1:
+            scores[i] *= 0
+        elif is_genre == True and is_new == True:
+            scores[i] *= (genre_weight+new_weight)
+        elif is_genre == True:
+            scores[i] *= genre_weight
+        elif is_new == True:
+            scores[i] *= new_weight
+    return scores
+
+def return_recommendations(member_id,num_recommend,new_weight,
+                           genre_weight,genre,include_read):
+    """
+    Returns a list of recommendations for a member, reusing the last list
+    made with the same arguments if it is recent enough and neither the
+    member's loans nor the database have changed since it was made.
+    Takes the same parameters as calculate_recommendations.
+
+    Returns:
+    recommended_books (list): List of popularity rankings (descending).
+    recommended_titles (list): List containing the corresponding book titles
+    to the values in recommended_books.
+    """
+    key = (member_id,num_recommend,new_weight,genre_weight,genre,include_read)
+    generation = db.return_catalog_generation()
+    version = db.return_member_version(member_id)
+    now = time.monotonic()
+    cached = recommendation_cache.get(key)
+    if (cached != None and now-cached[0] < recommendation_lifetime
+        and cached[1] == generation and cached[2] == version):
+        recommendation_cache.move_to_end(key)
+        recommended = cached[3]
+    else:
+        recommended = calculate_recommendations(member_id,num_recommend,\
+                                                new_weight,genre_weight,\
+                                                genre,include_read)
+        if recommended == None:
+            #The member ID was not valid
+            return None
+        recommendation_cache[key] = (now,generation,version,recommended)
+        recommendation_cache.move_to_end(key)
+        while len(recommendation_cache) > recommendation_cache_size:
+            #Remove the least recently used recommendations
+            recommendation_cache.popitem(last=False)
+    #Copy the lists so the cached recommendations cannot be changed
+    return list(recommended[0]),list(recommended[1])
+
+def clear_recommendations():
+    """
+    Forgets every recent recommendation, so the next ones are worked out
+    from scratch.
+
+    Returns:
+    void
+    """
+    recommendation_cache.clear()
+
+def calculate_recommendations(member_id,num_recommend,new_weight,
+                              genre_weight,genre,include_read):
+    """
+    Collects the information about the most popular books and the member's
+    favourite genre and sorts it into a list of 5 recommendations for the
+    member.
+
+    Parameters:
+    member_id (string): The ID of the member to create a recommendation
+    list for.
+    num_recommend (int): The number of books should be recommended by the
+    function.
+    new_weight (int): The priority given to new books in the algorithm
+    (higher is better).
+    genre_weight (int): The priority given to books belonging to the
+    member's favourite genre (higher is better).
+    include_read (bool): Whether the algorithm should omit books the
+    member has already read.
+
+    Returns:
+    recommended_books (list): List of popularity rankings (descending).
+    recommended_titles (list): List containing the corresponding book titles
+    to the values in recommended_books.
+    """
+    if db.validate_member_id(member_id) == True:
+        if genre != "DEFAULT":
+            favourite_genre = genre
+        else:
+            favourite_genre = return_member_genre(member_id)
+        if favourite_genre == None:
+            #The member has not rented from the library before
+            #so the system has no data on them.
+            #In this case, recommend them the most popular books.
+            #Apply a higher weighting to new books
+            return rank_titles(member_id,None,new_weight,genre_weight,\
+                               True,num_recommend)
+
+        #Apply a higher weighting to books in popular_books
+        #that are the member's preferred genre and new books.
+        #Decrease the weighting if the member has already read the book.
+        #Then add together scores of books with same title (different ID)
+        #and only return the top recommendations.
+        return rank_titles(member_id,favourite_genre,new_weight,\
+                           genre_weight,include_read,num_recommend)
+
+def return_coborrowed_books(member_id,num_recommend):
+    """
+    Recommends the titles most often borrowed by members who also borrowed
+    the books this member has borrowed. Each related book scores one point
+    for every member who borrowed it along with one of the member's books,
+    copies of the same title are added together, and titles the member has
+    already borrowed a copy of are left out.
+
+    Parameters:
+    member_id (string): The ID of the member to create a recommendation
+    list for.
+    num_recommend (int): The number of titles to recommend.
+
+    Returns:
+    recommended_books (list): The scores of the recommended titles
+    (descending).
+    recommended_titles (list): The recommended titles. Both lists are empty
+    if the member has not borrowed anything that others have borrowed too.
+    """
+    if db.validate_member_id(member_id) == True:
+        db.return_coborrowing()
+        book_labels = return_book_labels()
+        borrowed = coborrow.return_member_books(member_id)
+        read_titles = {book_labels.get(book_id) for book_id in borrowed}
+        totals = {}
+        #Only books borrowed alongside the member's books are looked at
+        for book_id,count in coborrow.return_related(borrowed).items():
+            title = book_labels.get(book_id)
+            if title != None and title not in read_titles:
+                totals[title] = totals.get(title,0)+count
+        return return_top_titles(list(totals.values()),list(totals.keys()),\
+                                 num_recommend)
+
+def return_genres():
+    """
+    Creates a list of every genre the library owns. The list is only made
+    again when the database has changed.
+
+    Returns:
+    genres (list): Contains each genre that the library owns a book of.
+    
+    """
+    generation = db.return_catalog_generation()
+    if catalog_genres["generation"] != generation:
+        #A dictionary keeps the first appearance of each genre in order
+        genres = dict.fromkeys(record[1] for record in db.return_database())
+        catalog_genres["genres"] = list(genres)
+        catalog_genres["generation"] = generation
+    return list(catalog_genres["genres"])
+
+if __name__ == "__main__":
+    #Database.txt and logfile.txt must be in LibraryFunctions folder for tests
+    #to work correctly
+    print(return_popular_books())
+    print(return_member_genre("coai"))
+    print(return_recommendations("coai",5,2,6,"DEFAULT",False))
+    print(return_recommendations("qwer",5,7,2,"DEFAULT",True))
+    print(is_book_new("13/1/2020"))
+    print(is_book_new("13/1/2021"))
+    print(is_book_new("24/11/2000"))
+    print(was_book_read("coai",12))
+    print(was_book_read("coai",21))
+    print(return_genres())
+            
+
+
+
+
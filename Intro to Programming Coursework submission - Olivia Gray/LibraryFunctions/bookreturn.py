@@ -1,45 +1,79 @@
-"""
-NAME
-    bookreturn
-
-DESCRIPTION
-    Functions relating to returning a book.
-
-MODULE CONTENTS
-    return_book(book_id)
-
-AUTHOR
-    Olivia Gray
-    24/11/2021
-
-"""
-
-import sys
-sys.path.append("DatabaseFuntions")
-
-import DatabaseFunctions.database as db
-from datetime import date
-
-def return_book(book_id):
-    """
-    Checks that a book is currently being loaned then updates the database
-    and log to show that it has just been returned.
-
-    Parameters:
-    book_id (string): The ID of the book being returned.
-
-    Returns:
-    (string): Represents that the book was successfully returned or not.
-    
-    """
-    if str(db.return_availability(book_id)) != "0":
-        db.update_log(book_id)
-        db.update_availability(book_id,"0")
-        return "Return complete"
-    else:
-        return "Book is already available"
-
-if __name__ == "__main__":
-    #Database.txt and logfile.txt must be in LibraryFunctions foler.
-    print(return_book("1"))
-    print(return_book("14"))
+"""
+NAME
+    bookreturn
+
+DESCRIPTION
+    Functions relating to returning a book.
+
+MODULE CONTENTS
+    return_book(book_id)
+    return_books(book_ids)
+
+AUTHOR
+    Olivia Gray
+    24/11/2021
+
+"""
+
+import sys
+sys.path.append("DatabaseFuntions")
+
+import DatabaseFunctions.database as db
+from datetime import date
+
+def return_book(book_id):
+    """
+    Checks that a book is currently being loaned then updates the database
+    and log to show that it has just been returned.
+
+    Parameters:
+    book_id (string): The ID of the book being returned.
+
+    Returns:
+    (string): Represents that the book was successfully returned or not.
+    
+    """
+    if db.record_return(book_id) == True:
+        return "Return complete"
+    else:
+        return "Book is already available"
+
+def return_books(book_ids):
+    """
+    Returns several books at once, such as when emptying the drop box.
+    Every open loan for the books is closed and every copy made available
+    together, rather than rewriting the log and database once per book.
+
+    Parameters:
+    book_ids (list): The IDs of the books being returned.
+
+    Returns:
+    results (list): For each book ID, in the same order, a message saying
+    whether that book was returned.
+    
+    """
+    results = []
+    valid_ids = []
+    for book_id in book_ids:
+        if db.validate_book_id(book_id) == True:
+            valid_ids.append(book_id)
+            results.append(None)
+        else:
+            results.append("Invalid book ID given")
+    returned = db.record_returns(valid_ids)
+    #Fill in the result of each valid book ID in the order they were given
+    j = 0
+    for i in range(len(results)):
+        if results[i] == None:
+            if returned[j] == True:
+                results[i] = "Return complete"
+            else:
+                results[i] = "Book is already available"
+            j += 1
+    return results
+
+if __name__ == "__main__":
+    #Database.txt and logfile.txt must be in LibraryFunctions foler.
+    print(return_book("1"))
+    print(return_book("14"))
+    print(return_books(["1","14","1","100"]))